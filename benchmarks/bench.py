@@ -0,0 +1,40 @@
+"""
+Times the string primitives on a few representative inputs.  Run from the
+repository root, optionally passing the root of another checkout to time that
+instead:
+
+    python benchmarks/bench.py [path]
+
+Each timing is the best of several repeats, in seconds.
+"""
+from __future__ import print_function, unicode_literals
+
+import os
+import platform
+import sys
+import timeit
+
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), '..'))
+
+from parsing.basic import digits, alphas  # noqa: E402
+from parsing.parsers import Literal, TakeAll, TakeUntil, Token, Sequence  # noqa: E402
+
+
+CASES = [
+    ('TakeWhile over 6000 chars', alphas, 'a' * 6000 + '1', 20),
+    ('Literal', Literal('select'), 'select * from t', 20000),
+    ('TakeUntil over 3000 chars', TakeUntil(Literal('*/')), 'x' * 3000 + '*/', 20),
+    ('TakeAll of 900 tokens', TakeAll(Token(Sequence(digits, Literal(',')))), '12, 345, 6789, ' * 300, 20),
+]
+
+
+def main():
+    print('{0} {1}'.format(platform.python_implementation(), platform.python_version()))
+
+    for name, p, s, number in CASES:
+        best = min(timeit.repeat(lambda: p.parse_string(s), number=number, repeat=5))
+        print('{0:<28} x{1:<6} {2:.4f}'.format(name, number, best))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,8 @@
-from .parsers import TakeWhile, Apply
-from .utils import is_digit, is_alpha, is_space
+from .parsers import TakeWhile, Spaces, Apply
+from .utils import is_digit, is_alpha
 
 
 digits = TakeWhile(is_digit)
 alphas = TakeWhile(is_alpha)
-spaces = TakeWhile(is_space)
+spaces = Spaces()
 positive_integer = Apply(int, digits)
@@ -0,0 +1,483 @@
+from __future__ import unicode_literals
+
+import heapq
+
+from .exceptions import ParseError, ImproperInputError, PlaceholderError
+from .parsers import (
+    Parser, Sequence, Alternatives, Placeholder, Optional, Discard, Discardable,
+    Apply, Token, TakeAll,
+)
+from .utils import truncate
+
+
+FAIL = object()
+
+
+def first(cs):
+    return cs[0]
+
+
+def sequence(cs):
+    return tuple(c for c in cs if not isinstance(c, Discardable))
+
+
+def productions(p):
+    """
+    Returns the grammar productions for the parser ``p`` as a list of ``(rhs,
+    build)`` pairs in order of preference, or ``None`` if ``p`` should be run
+    as a terminal.  ``build`` constructs the result of a production from the
+    results of the parsers in ``rhs``.
+    """
+    if isinstance(p, Sequence):
+        return [(p.ps, sequence)]
+
+    if isinstance(p, Alternatives):
+        return [((q,), first) for q in p.ps]
+
+    if isinstance(p, Placeholder):
+        if p.p is None:
+            raise PlaceholderError('Placeholder not yet defined')
+
+        return [((p.p,), first)]
+
+    if isinstance(p, Optional):
+        return [((p.p,), first), ((), lambda cs: Discardable(None))]
+
+    if isinstance(p, Discard):
+        return [((p.p,), lambda cs: Discardable(cs[0]))]
+
+    if isinstance(p, Apply):
+        return [((p.p,), lambda cs: p.f(cs[0]))]
+
+    if isinstance(p, Token):
+        # The separator is only tried after ``p`` has made its own choices
+        return [((p.p, Optional(p.s)), first)]
+
+    if isinstance(p, TakeAll):
+        return [((p, p.p), lambda cs: cs[0] + (cs[1],)), ((p.p,), lambda cs: (cs[0],))]
+
+    return None
+
+
+class Grammar(object):
+    """
+    The context-free grammar equivalent to the parser graph rooted at
+    ``start``.  Compound parsers become nonterminals and all other parsers are
+    treated as terminals which are run with their own ``parse`` method.
+    """
+    def __init__(self, start):
+        self.start = start
+
+        self.rules = []
+        self.by_lhs = {}
+
+        todo = [start]
+        while todo:
+            p = todo.pop()
+            if p in self.by_lhs:
+                continue
+
+            prods = productions(p)
+            if prods is None:
+                continue
+
+            self.by_lhs[p] = []
+            for rhs, build in prods:
+                self.by_lhs[p].append(len(self.rules))
+                self.rules.append((p, tuple(rhs), build))
+                todo.extend(rhs)
+
+        # Find nullable nonterminals by iterating to a fixed point
+        self.nullable = set()
+
+        changed = True
+        while changed:
+            changed = False
+
+            for lhs, rhs, _ in self.rules:
+                if lhs not in self.nullable and all(s in self.nullable for s in rhs):
+                    self.nullable.add(lhs)
+                    changed = True
+
+
+class Chart(object):
+    """
+    The Earley chart for one parse of ``xs`` with ``grammar``.  Positions are
+    stream offsets.  Each terminal is run at most once per position, which
+    bounds recognition at cubic time in the length of the input.
+    """
+    def __init__(self, grammar, xs):
+        self.grammar = grammar
+
+        self.cursors = {xs.offset: xs}
+        self.scans = {}
+        self.completed = {}
+
+        self.recognize(xs.offset)
+
+    def scan(self, p, i):
+        key = (p, i)
+
+        try:
+            return self.scans[key]
+        except KeyError:
+            pass
+
+        try:
+            x, xs = p(self.cursors[i])
+        except ParseError:
+            result = None
+        else:
+            result = (x, xs.offset)
+            self.cursors.setdefault(xs.offset, xs)
+
+        self.scans[key] = result
+
+        return result
+
+    def recognize(self, start):
+        rules = self.grammar.rules
+        by_lhs = self.grammar.by_lhs
+        nullable = self.grammar.nullable
+        completed = self.completed
+
+        items = {}
+        waiting = {}
+        pending = [start]
+
+        def add(i, item):
+            if i not in items:
+                items[i] = ([], set())
+                waiting[i] = {}
+                heapq.heappush(pending, i)
+
+            queue, seen = items[i]
+            if item not in seen:
+                seen.add(item)
+                queue.append(item)
+
+        for r in by_lhs[self.grammar.start]:
+            add(start, (r, 0, start))
+
+        while pending:
+            i = heapq.heappop(pending)
+            queue, _ = items[i]
+            waiting_i = waiting[i]
+
+            k = 0
+            while k < len(queue):
+                r, d, o = queue[k]
+                k += 1
+
+                lhs, rhs, _ = rules[r]
+
+                if d == len(rhs):
+                    completed.setdefault((lhs, o), set()).add(i)
+
+                    for r_, d_, o_ in waiting[o].get(lhs, ()):
+                        add(i, (r_, d_ + 1, o_))
+
+                    continue
+
+                sym = rhs[d]
+
+                if sym in by_lhs:
+                    if sym not in waiting_i:
+                        waiting_i[sym] = []
+
+                        for r_ in by_lhs[sym]:
+                            add(i, (r_, 0, i))
+
+                    waiting_i[sym].append((r, d, o))
+
+                    if sym in nullable or i in completed.get((sym, i), ()):
+                        add(i, (r, d + 1, o))
+                else:
+                    result = self.scan(sym, i)
+
+                    if result is not None:
+                        add(result[1], (r, d + 1, o))
+
+    def ends(self, p, i):
+        return self.completed.get((p, i), ())
+
+
+class Forest(object):
+    """
+    Extracts the preferred derivation from a recognized chart.  As with ordered
+    choice, each nonterminal prefers its productions in the order they were
+    given, and the span of a production is decided by the preferences of the
+    parsers within it, from left to right.  The result is the same as that of
+    the recursive descent parsers, except where recursive descent commits to
+    an alternative or optional parse which the chart can only complete by
+    choosing differently.  Take-all parsers prefer their ends in the order
+    their loop reaches them, each item taking its preferred span before the
+    next is tried, and left recursive parsers prefer the longest span.
+    """
+    def __init__(self, chart):
+        self.chart = chart
+        self.rules = chart.grammar.rules
+        self.by_lhs = chart.grammar.by_lhs
+
+        self.orders = {}
+        self.reaches = {}
+        self.runs = {}
+        self.results = {}
+        self.derivations = {}
+
+    def order(self, p, i):
+        """
+        Returns the ends of the spans which ``p`` can derive from ``i`` in
+        order of preference.
+        """
+        if p not in self.by_lhs:
+            result = self.chart.scan(p, i)
+            return () if result is None else (result[1],)
+
+        key = (p, i)
+
+        try:
+            return self.orders[key]
+        except KeyError:
+            pass
+
+        # Left recursive uses of ``p`` met while its order is being found
+        # prefer the longest span
+        self.orders[key] = tuple(sorted(self.chart.ends(p, i), reverse=True))
+
+        if isinstance(p, TakeAll):
+            ends = self.order_all(p, i)[0]
+            self.orders[key] = ends
+
+            return ends
+
+        ends = []
+        seen = set()
+
+        for r in self.by_lhs[p]:
+            for e in self.reach(r, 0, i)[0]:
+                if e not in seen:
+                    seen.add(e)
+                    ends.append(e)
+
+        ends = tuple(ends)
+        self.orders[key] = ends
+
+        return ends
+
+    def order_all(self, p, i):
+        """
+        Returns the ends of the spans which the take-all parser ``p`` can derive
+        from ``i`` in the order its loop prefers them, and the position each
+        end is reached from by its last item along the preferred path.
+        """
+        key = (p, i)
+
+        try:
+            return self.runs[key]
+        except KeyError:
+            pass
+
+        ends = []
+        parents = {}
+
+        def items(k):
+            return iter([e for e in self.order(p.p, k) if e > k])
+
+        # Going on to another item is preferred to stopping, so the ends are
+        # those of a depth first search over item ends in post-order.  The
+        # first path to reach an end is the preferred one, and every end which
+        # can be reached through a position already seen has been found.
+        for e in self.order(p.p, i):
+            if e in parents:
+                continue
+
+            parents[e] = i
+
+            if e == i:
+                ends.append(e)
+                continue
+
+            stack = [(e, items(e))]
+            while stack:
+                k, rest = stack[-1]
+
+                for e_ in rest:
+                    if e_ not in parents:
+                        parents[e_] = k
+                        stack.append((e_, items(e_)))
+                        break
+                else:
+                    stack.pop()
+                    ends.append(k)
+
+        result = (tuple(ends), parents)
+        self.runs[key] = result
+
+        return result
+
+    def reach(self, r, k, i):
+        """
+        Returns the ends which the parsers of rule ``r`` from the ``k``th can
+        derive from ``i``, in order of preference and as a set.
+        """
+        key = (r, k, i)
+
+        try:
+            return self.reaches[key]
+        except KeyError:
+            pass
+
+        rhs = self.rules[r][1]
+
+        if k == len(rhs):
+            result = ((i,), frozenset((i,)))
+        else:
+            self.reaches[key] = ((), frozenset())
+
+            ends = []
+            seen = set()
+
+            for e in self.order(rhs[k], i):
+                for e_ in self.reach(r, k + 1, e)[0]:
+                    if e_ not in seen:
+                        seen.add(e_)
+                        ends.append(e_)
+
+            result = (tuple(ends), frozenset(seen))
+
+        self.reaches[key] = result
+
+        return result
+
+    def build(self, p, i, j):
+        if p not in self.by_lhs:
+            result = self.chart.scan(p, i)
+            return result[0] if result is not None and result[1] == j else FAIL
+
+        key = (p, i, j)
+
+        try:
+            return self.results[key]
+        except KeyError:
+            pass
+
+        # Guard against cyclic derivations while this node is being built
+        self.results[key] = FAIL
+
+        if isinstance(p, TakeAll):
+            result = self.build_all(p, i, j) if j in self.chart.ends(p, i) else FAIL
+            self.results[key] = result
+
+            return result
+
+        for r in self.by_lhs[p]:
+            if j not in self.reach(r, 0, i)[1]:
+                continue
+
+            cs = self.derive(r, 0, i, j)
+
+            if cs is not None:
+                result = self.rules[r][2](cs)
+                self.results[key] = result
+
+                return result
+
+        return FAIL
+
+    def build_all(self, p, i, j):
+        # Walk the preferred path back from ``j`` in a loop rather than
+        # recursing once per item
+        parents = self.order_all(p, i)[1]
+        if j not in parents:
+            return FAIL
+
+        result = []
+
+        while True:
+            k = parents[j]
+
+            x = self.build(p.p, k, j)
+            if x is FAIL:
+                return FAIL
+
+            result.append(x)
+
+            if k == i:
+                result.reverse()
+                return tuple(result)
+
+            j = k
+
+    def derive(self, r, k, i, j):
+        key = (r, k, i, j)
+
+        try:
+            return self.derivations[key]
+        except KeyError:
+            pass
+
+        self.derivations[key] = None
+
+        rhs = self.rules[r][1]
+
+        if k == len(rhs):
+            cs = [] if i == j else None
+        else:
+            cs = None
+
+            for e in self.order(rhs[k], i):
+                if j not in self.reach(r, k + 1, e)[1]:
+                    continue
+
+                x = self.build(rhs[k], i, e)
+                if x is FAIL:
+                    continue
+
+                rest = self.derive(r, k + 1, e, j)
+                if rest is None:
+                    continue
+
+                cs = [x] + rest
+                break
+
+        self.derivations[key] = cs
+
+        return cs
+
+
+class Earley(Parser):
+    """
+    Runs the parser graph rooted at ``p`` with an Earley chart parser instead of
+    recursive descent.  Recognition takes at most cubic time in the length of
+    the input, even for ambiguous or heavily overlapping grammars which make
+    backtracking exponential.  The parse of a prefix of the input which is
+    preferred by ordered choice is returned (see ``Forest``).
+
+    Sequences, alternatives, placeholders, optional, discarded, applied,
+    token and take-all parsers are converted to grammar rules.  Any other
+    parser is treated as a terminal.  The grammar is compiled when the parser
+    is constructed, so any placeholders in ``p`` must already be set.
+    """
+    def __init__(self, p):
+        self.p = p
+        self.grammar = Grammar(p)
+
+    def parse(self, xs):
+        if self.p not in self.grammar.by_lhs:
+            return self.p(xs)
+
+        chart = Chart(self.grammar, xs)
+        forest = Forest(chart)
+
+        for j in forest.order(self.p, xs.offset):
+            x = forest.build(self.p, xs.offset, j)
+
+            if x is not FAIL:
+                return (x, chart.cursors[j])
+
+        furthest = chart.cursors[max(chart.cursors)]
+
+        raise furthest.get_error(ImproperInputError, 'No parse found for string "{0}"'.format(
+            truncate(xs),
+        ))
@@ -10,5 +10,24 @@ class ImproperInputError(ParseError):
     pass
 
 
+class LexError(ImproperInputError):
+    pass
+
+
 class PlaceholderError(Exception):
     pass
+
+
+class ParseLimitExceeded(Exception):
+    """
+    Raised when a parse exceeds one of the limits of its parse context.  Not a
+    ``ParseError``, so it is never caught by backtracking parsers.  Holds the
+    position, step count, nesting depth and memo size when the parse stopped.
+    """
+    def __init__(self, msg, position=None, steps=0, depth=0, memo_bytes=0):
+        super(ParseLimitExceeded, self).__init__(msg)
+
+        self.position = position
+        self.steps = steps
+        self.depth = depth
+        self.memo_bytes = memo_bytes
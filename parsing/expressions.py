@@ -0,0 +1,102 @@
+from __future__ import unicode_literals
+
+from .exceptions import ParseError, ImproperInputError
+from .parsers import Parser, Literal
+from .utils import truncate, string_types
+
+
+PREFIX = 'prefix'
+POSTFIX = 'postfix'
+LEFT = 'left'
+RIGHT = 'right'
+
+
+class Expression(Parser):
+    """
+    Constructs a parser for expressions built from operands parsed by ``atom``
+    and the operators described by ``table``.  Each entry in ``table`` is an
+    ``(ops, kind)`` pair describing one precedence level, ordered from the
+    tightest binding level to the loosest.  ``kind`` is one of ``PREFIX``,
+    ``POSTFIX``, ``LEFT`` or ``RIGHT`` (for left or right associative infix
+    operators).  ``ops`` is a sequence of ``(op, f)`` pairs where ``op`` is a
+    parser or a literal string and ``f`` builds the result of the operation
+    from its operand(s).
+
+    Expressions are parsed by precedence climbing, so each operand and operator
+    is visited once regardless of the number of precedence levels.
+    """
+    def __init__(self, atom, table):
+        self.atom = atom
+
+        self.prefix = []
+        self.postfix = []
+        self.infix = []
+
+        n = len(table)
+        for i, (ops, kind) in enumerate(table):
+            prec = n - i
+
+            for op, f in ops:
+                op = Literal(op) if isinstance(op, string_types) else op
+
+                if kind == PREFIX:
+                    self.prefix.append((op, f, prec))
+                elif kind == POSTFIX:
+                    self.postfix.append((op, f, prec))
+                elif kind == LEFT:
+                    self.infix.append((op, f, prec, prec + 1))
+                elif kind == RIGHT:
+                    self.infix.append((op, f, prec, prec))
+                else:
+                    raise ValueError('Unknown operator kind "{0}"'.format(kind))
+
+    def parse(self, xs):
+        return self.parse_expression(xs, 0)
+
+    def parse_expression(self, xs, min_prec):
+        x, xs = self.parse_operand(xs)
+
+        while True:
+            for op, f, prec in self.postfix:
+                if prec < min_prec:
+                    continue
+
+                try:
+                    _, xs = op(xs)
+                except ParseError:
+                    continue
+
+                x = f(x)
+                break
+            else:
+                for op, f, prec, next_prec in self.infix:
+                    if prec < min_prec:
+                        continue
+
+                    try:
+                        _, xs_ = op(xs)
+                        y, xs_ = self.parse_expression(xs_, next_prec)
+                    except ParseError:
+                        continue
+
+                    x, xs = f(x, y), xs_
+                    break
+                else:
+                    return (x, xs)
+
+    def parse_operand(self, xs):
+        for op, f, prec in self.prefix:
+            try:
+                _, xs_ = op(xs)
+                x, xs_ = self.parse_expression(xs_, prec)
+            except ParseError:
+                continue
+
+            return (f(x), xs_)
+
+        try:
+            return self.atom(xs)
+        except ParseError:
+            raise xs.get_error(ImproperInputError, 'No expression found in string "{0}"'.format(
+                truncate(xs),
+            ))
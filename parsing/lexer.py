@@ -0,0 +1,93 @@
+from __future__ import unicode_literals
+
+import re
+
+from .exceptions import LexError, NotEnoughInputError, ImproperInputError
+from .parsers import Parser
+from .streams import EndOfStringError, LimitedTokenStream, ParseContext, TokenStream, position_of
+from .utils import truncate
+
+
+class Lexer(object):
+    """
+    Constructs a lexer from the given ``rules``, a sequence of ``(kind,
+    pattern)`` pairs.  All patterns are combined into a single master regular
+    expression so that each character of the input is scanned exactly once.
+    Rules are tried in order, so keywords should be listed before more general
+    patterns such as identifiers.  Tokens whose kind is in ``skip`` are matched
+    but not emitted.
+    """
+    def __init__(self, rules, skip=(), flags=0):
+        rules = tuple(rules)
+
+        self.kinds = dict(('_{0}'.format(i), kind) for i, (kind, _) in enumerate(rules))
+        self.skip = frozenset(skip)
+        self.pattern = re.compile('|'.join(
+            '(?P<_{0}>{1})'.format(i, pattern) for i, (_, pattern) in enumerate(rules)
+        ), flags)
+
+    def tokenize(self, s):
+        """
+        Returns a list of ``(kind, start, end)`` tuples for the tokens in the
+        string ``s``.
+        """
+        match = self.pattern.match
+        kinds = self.kinds
+        skip = self.skip
+
+        tokens = []
+        append = tokens.append
+
+        i, n = 0, len(s)
+        while i < n:
+            m = match(s, i)
+
+            if m is None or m.end() == i:
+                line, col = position_of(s, i)
+                raise LexError('At line {0}, col {1}: No token found in string "{2}"'.format(
+                    line, col, truncate(s[i:]),
+                ))
+
+            kind, j = kinds[m.lastgroup], m.end()
+            if kind not in skip:
+                append((kind, i, j))
+
+            i = j
+
+        return tokens
+
+    def stream(self, s, **limits):
+        """
+        Returns a token stream for the string ``s`` with a new parse context,
+        which is given any parse ``limits``.
+        """
+        context = ParseContext(**limits)
+        stream = LimitedTokenStream if context.limited else TokenStream
+
+        return stream(s, self.tokenize(s), 0, context)
+
+
+class Kind(Parser):
+    """
+    Constructs a parser which takes a single token of the given ``kind`` from a
+    token stream and returns its text.
+    """
+    def __init__(self, kind):
+        self.kind = kind
+
+    def parse(self, xs):
+        try:
+            ts, xs_ = xs.read(1)
+        except EndOfStringError:
+            raise xs.get_error(NotEnoughInputError, 'Expected token of kind "{0}"'.format(
+                self.kind,
+            ))
+
+        token = ts[0]
+        if token[0] != self.kind:
+            raise xs.get_error(ImproperInputError, 'Expected token of kind "{0}" but found "{1}"'.format(
+                self.kind,
+                token[0],
+            ))
+
+        return (xs.text(token), xs_)
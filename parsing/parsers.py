@@ -1,22 +1,208 @@
 from __future__ import unicode_literals
 
+from collections import OrderedDict, namedtuple
+from functools import partial
+import re
+import sys
+import threading
+import weakref
+
 from .exceptions import ParseError, NotEnoughInputError, ImproperInputError, PlaceholderError
-from .streams import EndOfStringError, CursorString
-from .utils import truncate, equals
+from .streams import (
+    EndOfStringError, CursorString, LimitedCursorString, LimitedTokenStream, ParseContext, TokenStream,
+)
+from .utils import truncate, equals, freeze, iflatten, join, is_space, string_types
+
+try:
+    RecursionError
+except NameError:  # pragma: no cover
+    RecursionError = RuntimeError
+
+
+class Interned(type):
+    """
+    Metaclass which makes constructing a parser with the same class and
+    arguments as a live parser return that parser instead of a new one.
+    Structurally identical parts of a grammar are therefore built once and
+    share any work keyed on parser identity, such as memoized results.  Classes
+    which hold mutable state set ``interned`` to ``False``, and arguments which
+    are not hashable disable interning for that call.
+    """
+    instances = weakref.WeakValueDictionary()
+    lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        if not cls.interned:
+            return super(Interned, cls).__call__(*args, **kwargs)
 
+        key = (
+            cls,
+            tuple((type(a), a) for a in args),
+            tuple(sorted((k, type(v), v) for k, v in kwargs.items())),
+        )
+
+        try:
+            with Interned.lock:
+                p = Interned.instances.get(key)
+        except TypeError:
+            return super(Interned, cls).__call__(*args, **kwargs)
+
+        if p is None:
+            p = super(Interned, cls).__call__(*args, **kwargs)
+
+            with Interned.lock:
+                p = Interned.instances.setdefault(key, p)
+
+        return p
+
+
+class Parser(Interned(str('InternedParser'), (object,), {})):
+    """
+    Base class for all parsers.  Once a grammar has been built (and all of its
+    placeholders set) it is not modified by parsing, so a grammar may be shared
+    between threads.  Any state needed during a single parse is kept in the
+    ``ParseContext`` of the stream being parsed.
+    """
+    interned = True
 
-class Parser(object):
     def __call__(self, xs):
         return self.parse(xs)
 
+    def skip(self, xs):
+        """
+        Returns the stream after the input this parser consumes from ``xs``.
+        Parsers may override this to avoid building results which would only
+        be thrown away, as when a span of the input is wanted instead.
+        """
+        return self(xs)[1]
+
     def __and__(self, other):
         return Sequence(self, other)
 
     def __or__(self, other):
         return Alternatives(self, other)
 
-    def parse_string(self, s):
-        return self.parse(CursorString(s))
+    def parse_string(self, s, max_steps=None, max_depth=None, deadline=None, max_memo_bytes=None):
+        """
+        Parses the string ``s``.  The parse may be limited to ``max_steps``
+        operations on the input, ``max_depth`` nested parser calls,
+        ``deadline`` seconds and roughly ``max_memo_bytes`` of memoized
+        results.  ``ParseLimitExceeded`` is raised if a limit is exceeded.
+        """
+        context = self.get_context(max_steps, max_depth, deadline, max_memo_bytes)
+        stream = LimitedCursorString if context is not None and context.limited else CursorString
+
+        return self.parse_stream(stream(s, context=context))
+
+    def parse_batch(self, inputs, executor=None, **limits):
+        """
+        Parses each string in ``inputs`` and returns a list of the results.  If
+        a ``concurrent.futures`` executor is given, the strings are parsed with
+        it.  The first parse error encountered is raised.
+        """
+        parse = partial(self.parse_string, **limits)
+
+        if executor is None:
+            return [parse(s) for s in inputs]
+
+        return list(executor.map(parse, inputs))
+
+    def parse_tokens(self, s, lexer, **limits):
+        context = self.get_context(**limits)
+        stream = LimitedTokenStream if context is not None and context.limited else TokenStream
+
+        return self.parse_stream(stream(s, lexer.tokenize(s), 0, context))
+
+    def parse_stream(self, xs):
+        """
+        Parses the stream ``xs``, reporting exhaustion of the interpreter's
+        recursion limit as ``ParseLimitExceeded`` rather than crashing.
+        """
+        context = xs.context
+
+        try:
+            if context is None or context.max_depth is None:
+                return self(xs)
+
+            return parse_nested(self, xs, context)
+        except RecursionError as e:
+            # Python 2 raises a plain RuntimeError, which user code may raise too
+            if RecursionError is RuntimeError and 'recursion' not in str(e):
+                raise
+
+            context = context or ParseContext()
+            raise context.get_error(xs, 'Recursion limit exceeded')
+
+    def get_context(self, max_steps=None, max_depth=None, deadline=None, max_memo_bytes=None):
+        """
+        Returns a new parse context with the given limits, or ``None`` if there
+        are no limits and no parser in this grammar memoizes its results.
+        """
+        if max_steps is None and max_depth is None and deadline is None and max_memo_bytes is None:
+            try:
+                memoized = self._memoized
+            except AttributeError:
+                memoized = self._memoized = is_memoized(self)
+
+            if not memoized:
+                return None
+
+        return ParseContext(max_steps, max_depth, deadline, max_memo_bytes)
+
+    def cached(self, maxsize=128):
+        return Cached(self, maxsize)
+
+
+def is_memoized(p):
+    """
+    Returns whether any parser in the grammar reached from ``p`` is a
+    ``Memoize`` parser, which keeps its results in the parse context.
+    """
+    seen = set()
+    todo = [p]
+
+    while todo:
+        x = todo.pop()
+
+        if isinstance(x, (list, tuple)):
+            todo.extend(x)
+        elif isinstance(x, Parser) and id(x) not in seen:
+            if isinstance(x, Memoize):
+                return True
+
+            seen.add(id(x))
+            todo.extend(vars(x).values())
+
+    return False
+
+
+def parse_nested(p, xs, context):
+    """
+    Parses the stream ``xs`` with ``p`` while counting nested parser calls in
+    ``context`` and raising ``ParseLimitExceeded`` once there are more than
+    its ``max_depth``.  Calls are counted by a profile function which is only
+    installed for the duration of a depth limited parse.
+    """
+    code = Parser.__dict__['__call__'].__code__
+    max_depth = context.max_depth
+
+    def profile(frame, event, arg):
+        if frame.f_code is code:
+            if event == 'call':
+                context.depth += 1
+
+                if context.depth > max_depth:
+                    raise context.get_error(frame.f_locals['xs'], 'Depth limit of {0} exceeded'.format(max_depth))
+            elif event == 'return':
+                context.depth -= 1
+
+    previous = sys.getprofile()
+    sys.setprofile(profile)
+
+    try:
+        return p(xs)
+    finally:
+        sys.setprofile(previous)
 
 
 class TakeItems(Parser):
@@ -31,15 +217,22 @@ class TakeItems(Parser):
         self.n = n
 
     def parse(self, xs):
-        n = self.n
+        try:
+            return xs.read(self.n)
+        except EndOfStringError:
+            raise self.get_error(xs)
 
+    def skip(self, xs):
         try:
-            return xs.read(n)
+            return xs.advance(self.n)
         except EndOfStringError:
-            raise xs.get_error(NotEnoughInputError, 'Expected at least {0} char(s) in string "{1}"'.format(
-                n,
-                truncate(xs),
-            ))
+            raise self.get_error(xs)
+
+    def get_error(self, xs):
+        return xs.get_error(NotEnoughInputError, 'Expected at least {0} char(s) in string "{1}"'.format(
+            self.n,
+            truncate(xs),
+        ))
 
 
 class TakeIf(Parser):
@@ -82,6 +275,21 @@ class Literal(TakeItemsIf):
     def __init__(self, s):
         super(Literal, self).__init__(len(s), equals(s))
 
+        self.s = s
+
+    def parse(self, xs):
+        # Compare in place without slicing when parsing a string
+        if isinstance(xs, CursorString) and xs.startswith(self.s):
+            return xs.read(len(self.s))
+
+        return super(Literal, self).parse(xs)
+
+    def skip(self, xs):
+        if isinstance(xs, CursorString) and xs.startswith(self.s):
+            return xs.advance(len(self.s))
+
+        return super(Literal, self).skip(xs)
+
 
 class TakeWhile(TakeItemsIf):
     """
@@ -92,24 +300,57 @@ class TakeWhile(TakeItemsIf):
         super(TakeWhile, self).__init__(1, f)
 
     def parse(self, xs):
-        result = []
+        if isinstance(xs, CursorString):
+            n = xs.scan(self.f)
+            if n > 0:
+                return xs.read(n)
+
+        # Count the items which match and read them all at once, so token
+        # streams give a tuple of tokens rather than a string
+        xs_ = xs
 
         i = 0
         while True:
             try:
-                x, xs_ = super(TakeWhile, self).parse(xs)
+                _, xs_ = super(TakeWhile, self).parse(xs_)
             except ParseError as e:
                 # If no parsing can be done at all, raise an error
                 if i == 0:
                     raise e
 
-                return (''.join(result), xs)
-
-            result.append(x)
-            xs = xs_
+                return xs.read(i)
 
             i += 1
 
+    def skip(self, xs):
+        if isinstance(xs, CursorString):
+            n = xs.scan(self.f)
+            if n > 0:
+                return xs.advance(n)
+
+        return super(TakeWhile, self).skip(xs)
+
+
+class Spaces(TakeWhile):
+    """
+    Constructs a parser which takes whitespace chars.  Token streams hold no
+    whitespace, so on them it always fails without consuming anything.
+    """
+    def __init__(self):
+        super(Spaces, self).__init__(is_space)
+
+    def parse(self, xs):
+        if not isinstance(xs, CursorString):
+            raise xs.get_error(ImproperInputError, 'No whitespace in token stream')
+
+        return super(Spaces, self).parse(xs)
+
+    def skip(self, xs):
+        if not isinstance(xs, CursorString):
+            raise xs.get_error(ImproperInputError, 'No whitespace in token stream')
+
+        return super(Spaces, self).skip(xs)
+
 
 class TakeUntil(Parser):
     """
@@ -119,12 +360,35 @@ class TakeUntil(Parser):
     move = TakeItems(1)
 
     def __init__(self, p):
-        self.p = Literal(p) if isinstance(p, basestring) else p
+        self.p = Literal(p) if isinstance(p, string_types) else p
+
+    def find(self, xs):
+        # Search for a literal terminal directly when parsing a string
+        n = xs.find(self.p.s)
+        if n > 0:
+            return n
+
+        if n == -1:
+            raise xs.get_error(ImproperInputError, 'Terminal parser never succeeded in string "{0}"'.format(
+                truncate(xs),
+            ))
+
+        raise xs.get_error(ImproperInputError, 'No content captured before terminal parser succeeded in string "{0}"'.format(
+            truncate(xs),
+        ))
+
+    def skip(self, xs):
+        if isinstance(xs, CursorString) and isinstance(self.p, Literal):
+            return xs.advance(self.find(xs))
+
+        return super(TakeUntil, self).skip(xs)
 
     def parse(self, xs):
+        if isinstance(xs, CursorString) and isinstance(self.p, Literal):
+            return xs.read(self.find(xs))
+
         xs_ = xs
 
-        result = []
         i = 0
         while True:
             try:
@@ -134,8 +398,7 @@ class TakeUntil(Parser):
                 pass
 
             try:
-                x, xs = self.move(xs)
-                result.append(x)
+                xs = self.move.skip(xs)
             except NotEnoughInputError:
                 raise xs_.get_error(ImproperInputError, 'Terminal parser never succeeded in string "{0}"'.format(
                     truncate(xs_),
@@ -148,7 +411,38 @@ class TakeUntil(Parser):
                 truncate(xs_),
             ))
 
-        return (''.join(result), xs)
+        return xs_.read(i)
+
+
+class Regex(Parser):
+    """
+    Constructs a parser which parses text matching the regular expression
+    ``pattern``.  The pattern is matched in place against the input string.
+    """
+    def __init__(self, pattern, flags=0):
+        self.pattern = re.compile(pattern, flags)
+
+    def match(self, xs):
+        if len(xs) == 0:
+            raise xs.get_error(NotEnoughInputError, 'Expected match for pattern "{0}"'.format(
+                self.pattern.pattern,
+            ))
+
+        m = xs.match(self.pattern)
+
+        if m is None or m.end() == m.start():
+            raise xs.get_error(ImproperInputError, 'Pattern "{0}" not matched in string "{1}"'.format(
+                self.pattern.pattern,
+                truncate(xs),
+            ))
+
+        return m.end() - m.start()
+
+    def parse(self, xs):
+        return xs.read(self.match(xs))
+
+    def skip(self, xs):
+        return xs.advance(self.match(xs))
 
 
 class TakeAll(Parser):
@@ -181,12 +475,212 @@ class TakeAll(Parser):
 
         return (tuple(result), xs)
 
+    def skip(self, xs):
+        try:
+            xs = self.p.skip(xs)
+        except ParseError:
+            raise xs.get_error(ImproperInputError, 'Could not parse anything from string "{0}"'.format(
+                truncate(xs),
+            ))
+
+        try:
+            while True:
+                xs = self.p.skip(xs)
+        except ParseError:
+            return xs
+
+
+class Many(Parser):
+    """
+    Augments the given parser ``p`` to apply itself to the input at least
+    ``min`` and at most ``max`` times, returning its results as a tuple.  If
+    ``max`` is ``None``, there is no upper bound.  Repetition also stops if
+    ``p`` succeeds without consuming any input.
+    """
+    def __init__(self, p, min=0, max=None):
+        if min < 0 or (max is not None and max < min):
+            raise ValueError('Must provide 0 <= min <= max')
+
+        self.p = p
+        self.min = min
+        self.max = max
+
+    def parse(self, xs):
+        p, max_ = self.p, self.max
+
+        result = []
+        append = result.append
+
+        xs_ = xs
+
+        # The loop only ends with an exception once, when ``p`` fails
+        try:
+            while max_ is None or len(result) < max_:
+                x, ys = p(xs_)
+                append(x)
+
+                if ys.offset == xs_.offset:
+                    break
+
+                xs_ = ys
+        except ParseError:
+            pass
+
+        if len(result) < self.min:
+            raise self.get_error(xs)
+
+        return (tuple(result), xs_)
+
+    def skip(self, xs):
+        p, max_ = self.p, self.max
+
+        i = 0
+        xs_ = xs
+
+        try:
+            while max_ is None or i < max_:
+                ys = p.skip(xs_)
+                i += 1
+
+                if ys.offset == xs_.offset:
+                    break
+
+                xs_ = ys
+        except ParseError:
+            pass
+
+        if i < self.min:
+            raise self.get_error(xs)
+
+        return xs_
+
+    def get_error(self, xs):
+        return xs.get_error(ImproperInputError, 'Expected at least {0} item(s) in string "{1}"'.format(
+            self.min,
+            truncate(xs),
+        ))
+
+
+class SepBy(Parser):
+    """
+    Constructs a parser which parses zero or more items with the parser ``p``
+    separated by items parsed with the parser ``sep``.  Only the results of
+    ``p`` are returned, as a tuple.  If ``trailing`` is ``True``, a separator
+    after the last item is also consumed.
+    """
+    def __init__(self, p, sep, trailing=False):
+        self.p = p
+        self.sep = Literal(sep) if isinstance(sep, string_types) else sep
+        self.trailing = trailing
+
+    def parse(self, xs):
+        p, sep = self.p, self.sep
+
+        result = []
+        append = result.append
+
+        xs_sep = None
+
+        try:
+            x, xs = p(xs)
+            append(x)
+
+            while True:
+                xs_sep = None
+                xs_sep = sep.skip(xs)
+
+                x, ys = p(xs_sep)
+                append(x)
+
+                # Stop if neither ``sep`` nor ``p`` consumed anything, since
+                # they would do the same again forever
+                if ys.offset == xs.offset:
+                    break
+
+                xs = ys
+        except ParseError:
+            if self.trailing and xs_sep is not None:
+                xs = xs_sep
+
+        return (tuple(result), xs)
+
+    def skip(self, xs):
+        p, sep = self.p, self.sep
+
+        xs_sep = None
+
+        try:
+            xs = p.skip(xs)
+
+            while True:
+                xs_sep = None
+                xs_sep = sep.skip(xs)
+
+                ys = p.skip(xs_sep)
+
+                if ys.offset == xs.offset:
+                    break
+
+                xs = ys
+        except ParseError:
+            if self.trailing and xs_sep is not None:
+                xs = xs_sep
+
+        return xs
+
+
+class Count(Parser):
+    """
+    Augments the given parser ``p`` to apply itself to the input exactly ``n``
+    times, returning its results as a tuple.
+    """
+    def __init__(self, p, n):
+        if n < 0:
+            raise ValueError('Must provide integer greater than or equal to zero')
+
+        self.p = p
+        self.n = n
+
+    def parse(self, xs):
+        p = self.p
+        result = [None] * self.n
+
+        xs_ = xs
+
+        try:
+            for i in range(self.n):
+                result[i], xs_ = p(xs_)
+        except ParseError:
+            raise self.get_error(xs)
+
+        return (tuple(result), xs_)
+
+    def skip(self, xs):
+        p = self.p
+
+        xs_ = xs
+
+        try:
+            for _ in range(self.n):
+                xs_ = p.skip(xs_)
+        except ParseError:
+            raise self.get_error(xs)
+
+        return xs_
+
+    def get_error(self, xs):
+        return xs.get_error(ImproperInputError, 'Expected {0} item(s) in string "{1}"'.format(
+            self.n,
+            truncate(xs),
+        ))
+
 
 class Token(Parser):
     """
     Augments the given parser ``p`` to consume any whitespace after items
     successfully parsed by ``p``.  The parser ``separation_parser`` can be
-    provided to customize whitespace parsing behavior.
+    provided to customize whitespace parsing behavior.  The default separator
+    consumes nothing from token streams, which hold no whitespace.
     """
     def __init__(self, p, separation_parser=None):
         self.p = p
@@ -207,6 +701,14 @@ class Token(Parser):
 
         return (x, xs)
 
+    def skip(self, xs):
+        xs = self.p.skip(xs)
+
+        try:
+            return self.s.skip(xs)
+        except (NotEnoughInputError, ImproperInputError):
+            return xs
+
 
 class Discardable(object):
     def __init__(self, result):
@@ -226,12 +728,15 @@ class Discard(Parser):
     ``Sequence`` parsers.
     """
     def __init__(self, p):
-        self.p = Literal(p) if isinstance(p, basestring) else p
+        self.p = Literal(p) if isinstance(p, string_types) else p
 
     def parse(self, xs):
         x, xs = self.p(xs)
         return (Discardable(x), xs)
 
+    def skip(self, xs):
+        return self.p.skip(xs)
+
 
 class Optional(Parser):
     """
@@ -247,6 +752,12 @@ class Optional(Parser):
         except ParseError:
             return (Discardable(None), xs)
 
+    def skip(self, xs):
+        try:
+            return self.p.skip(xs)
+        except ParseError:
+            return xs
+
 
 class Compound(Parser):
     def __init__(self, *ps):
@@ -278,6 +789,19 @@ class Sequence(Compound):
 
         return (tuple(result), xs)
 
+    def skip(self, xs):
+        xs_ = xs
+
+        try:
+            for p in self.ps:
+                xs = p.skip(xs)
+        except ParseError:
+            raise xs_.get_error(ImproperInputError, 'Sequence not found in string "{0}"'.format(
+                truncate(xs_),
+            ))
+
+        return xs
+
 
 class Alternatives(Compound):
     """
@@ -296,6 +820,17 @@ class Alternatives(Compound):
             truncate(xs),
         ))
 
+    def skip(self, xs):
+        for p in self.ps:
+            try:
+                return p.skip(xs)
+            except ParseError:
+                pass
+
+        raise xs.get_error(ImproperInputError, 'No alternatives found in string "{0}"'.format(
+            truncate(xs),
+        ))
+
 
 class Apply(Parser):
     """
@@ -310,14 +845,82 @@ class Apply(Parser):
         x, xs = self.p(xs)
         return (self.f(x), xs)
 
+    def skip(self, xs):
+        return self.p.skip(xs)
+
+
+class Spanned(Parser):
+    """
+    Augments the given parser ``p`` to return a span of the input it consumed
+    instead of its result.  ``p`` only advances over the input, so take parsers
+    build no substrings, sequences build no tuples and applied functions are
+    not called.  The substring is only built when the span's text is accessed.
+    If a function ``f`` is given, it is applied to the text when the span's
+    value is first accessed.
+
+    The result is a single flat span: the parts consumed by parsers within
+    ``p`` are not kept, and functions applied within ``p`` are dropped rather
+    than deferred.  Wrap the parts of interest in their own ``Spanned``
+    parsers to keep them.
+    """
+    def __init__(self, p, f=None):
+        self.p = p
+        self.f = f
+
+    def parse(self, xs):
+        xs_ = self.p.skip(xs)
+        return (xs.span(xs_, self.f), xs_)
+
+    def skip(self, xs):
+        return self.p.skip(xs)
+
+
+class Memoize(Parser):
+    """
+    Augments the given parser ``p`` to remember its result or failure at each
+    position of the input, so that backtracking parsers do not parse the same
+    input with ``p`` more than once.  Results are kept in the parse context and
+    are discarded when the parse ends.
+    """
+    def __init__(self, p):
+        self.p = p
+
+    def parse(self, xs):
+        context = xs.context
+        if context is None:
+            return self.p(xs)
+
+        key = (self, xs.offset)
+
+        try:
+            ok, value = context.memo[key]
+        except KeyError:
+            try:
+                value = self.p(xs)
+                ok = True
+            except ParseError as e:
+                value = (type(e), e.args)
+                ok = False
+
+            context.remember(key, (ok, value), xs)
+
+        if ok:
+            return value
+
+        ErrorClass, args = value
+        raise ErrorClass(*args)
+
 
 class Placeholder(Parser):
     """
     Acts as a proxy to the parser ``p`` which is given as an argument to the
     ``set`` method.  Allows for definition of recursive parsers.  A parser may
     be defined as a placeholder and then may refer to this placeholder when the
-    actual parsing operation is defined with ``set``.
+    actual parsing operation is defined with ``set``.  Placeholders should be
+    set before a grammar is shared between threads.
     """
+    interned = False
+
     def __init__(self):
         self.p = None
 
@@ -330,6 +933,12 @@ class Placeholder(Parser):
 
         return self.p(*args, **kwargs)
 
+    def skip(self, xs):
+        if self.p is None:
+            raise PlaceholderError('Placeholder not yet defined')
+
+        return self.p.skip(xs)
+
 
 class First(Apply):
     """
@@ -339,3 +948,108 @@ class First(Apply):
     """
     def __init__(self, p):
         super(First, self).__init__(lambda t: t[0], p)
+
+
+class Collect(Apply):
+    """
+    Augments a parser to flatten its possibly nested result into a container
+    built by ``into``.  This is post-processing of the finished result, as with
+    ``Apply``; the nested tuples are still built first and then walked once.
+    """
+    def __init__(self, p, into=list):
+        super(Collect, self).__init__(lambda x: into(iflatten(x)), p)
+
+
+class Flatten(Collect):
+    """
+    Augments a parser to return its possibly nested result as a flat tuple.
+    """
+    def __init__(self, p):
+        super(Flatten, self).__init__(p, tuple)
+
+
+class Join(Collect):
+    """
+    Augments a parser to join the strings in its possibly nested result into a
+    single string.
+    """
+    def __init__(self, p):
+        super(Join, self).__init__(p, join)
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class Cached(Parser):
+    """
+    Augments the given parser ``p`` to remember the results of up to
+    ``maxsize`` calls to ``parse_string``, keyed by the input string.  The
+    least recently used result is evicted when the cache is full.  Parse
+    failures are remembered as well and raised again as fresh exceptions.
+    Parsing anything other than a whole string is not cached.
+
+    Cached results are shared between callers, so they are frozen with
+    ``freeze`` before they are stored: lists in a result are returned as tuples
+    and arrays as read-only arrays.  Other mutable results must not be modified.
+    Only the position of the rest of the string is stored, and each call gets
+    a new cursor there with no parse context, so no memoized results or limits
+    of one parse are shared with another.
+    """
+    interned = False
+
+    def __init__(self, p, maxsize=128):
+        if maxsize < 1:
+            raise ValueError('Must provide integer greater than zero')
+
+        self.p = p
+        self.maxsize = maxsize
+
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = self.misses = self.evictions = 0
+
+    def parse(self, xs):
+        return self.p(xs)
+
+    def parse_string(self, s, **limits):
+        with self.lock:
+            try:
+                result = self.cache.pop(s)
+            except KeyError:
+                result = None
+            else:
+                self.cache[s] = result
+                self.hits += 1
+
+        if result is None:
+            try:
+                x, xs = self.p.parse_string(s, **limits)
+                result = (True, (freeze(x), xs.offset, xs.position))
+            except ParseError as e:
+                result = (False, (type(e), e.args))
+
+            with self.lock:
+                self.misses += 1
+                self.cache[s] = result
+
+                while len(self.cache) > self.maxsize:
+                    self.cache.popitem(last=False)
+                    self.evictions += 1
+
+        ok, value = result
+        if ok:
+            x, i, (line, col) = value
+            return (x, CursorString(s, line, col, i))
+
+        ErrorClass, args = value
+        raise ErrorClass(*args)
+
+    def cache_info(self):
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.cache))
+
+    def cache_clear(self):
+        with self.lock:
+            self.cache.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -1,5 +1,16 @@
 from __future__ import unicode_literals
 
+import bisect
+import sys
+import time
+
+from .exceptions import ParseLimitExceeded
+
+try:
+    clock = time.monotonic
+except AttributeError:  # pragma: no cover
+    clock = time.time
+
 
 class EndOfStringError(Exception):
     def __init__(self, msg, result=None):
@@ -7,56 +18,450 @@ class EndOfStringError(Exception):
         self.result = result
 
 
+def position_of(s, i):
+    """
+    Returns the line and column of the character at offset ``i`` in the string
+    ``s``.
+    """
+    line = s.count('\n', 0, i) + 1
+    col = i - s.rfind('\n', 0, i)
+
+    return line, col
+
+
+def line_starts(s):
+    """
+    Returns the offsets at which each line of the string ``s`` starts.
+    """
+    starts = [0]
+    append = starts.append
+
+    i = s.find('\n')
+    while i != -1:
+        append(i + 1)
+        i = s.find('\n', i + 1)
+
+    return starts
+
+
+class ParseContext(object):
+    """
+    Holds the state of a single parse, such as memoized results.  A new context
+    is created for each parse and shared by all streams derived from its input,
+    so parsers themselves never hold per-parse state.
+
+    A context may also limit the parse to ``max_steps`` operations on the
+    input, ``max_depth`` nested parser calls, ``deadline`` seconds of running
+    time and roughly ``max_memo_bytes`` of memoized results.  Exceeding a limit
+    raises a ``ParseLimitExceeded`` error.  Steps and time are checked by the
+    limited streams, which are only used when one of them is set, and depth is
+    counted by ``Parser.parse_stream`` only when ``max_depth`` is set.
+    """
+    # Check the clock only every so many steps to keep limited parses cheap
+    clock_interval = 256
+
+    def __init__(self, max_steps=None, max_depth=None, deadline=None, max_memo_bytes=None):
+        self.memo = {}
+        self.memo_bytes = 0
+
+        self.max_steps = max_steps
+        self.max_depth = max_depth
+        self.deadline = None if deadline is None else clock() + deadline
+        self.max_memo_bytes = max_memo_bytes
+
+        self.limited = not (max_steps is None and deadline is None)
+        self.steps = 0
+        self.depth = 0
+
+    def step(self, xs):
+        """
+        Counts an operation on the input at the stream ``xs``.
+        """
+        self.steps += 1
+
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise self.get_error(xs, 'Step limit of {0} exceeded'.format(self.max_steps))
+
+        if self.deadline is not None and self.steps % self.clock_interval == 0 and clock() > self.deadline:
+            raise self.get_error(xs, 'Deadline exceeded')
+
+    def remember(self, key, entry, xs):
+        """
+        Stores the memoized ``entry`` for ``key``, parsed from the stream
+        ``xs``.  Successful entries hold a result and the stream after it.
+        """
+        self.memo[key] = entry
+
+        if self.max_memo_bytes is not None:
+            self.memo_bytes += self.sizeof(entry, xs)
+
+            if self.memo_bytes > self.max_memo_bytes:
+                raise self.get_error(xs, 'Memo limit of {0} bytes exceeded'.format(self.max_memo_bytes))
+
+    @staticmethod
+    def sizeof(entry, xs):
+        """
+        Estimates the memory held by a memoized ``entry`` parsed from ``xs``.
+        A result is measured as its own size plus one byte for each source
+        character it was parsed from, which stands for the text in any nested
+        results without walking them.  A failure is measured by its message.
+        """
+        ok, value = entry
+
+        if not ok:
+            return sys.getsizeof(entry) + sum(sys.getsizeof(a) for a in value[1])
+
+        result, xs_ = value
+
+        return sys.getsizeof(entry) + sys.getsizeof(result) + len(xs.span(xs_))
+
+    def get_error(self, xs, msg):
+        p = xs.position
+
+        return ParseLimitExceeded(
+            'At line {0}, col {1}: {2} after {3} step(s)'.format(p[0], p[1], msg, self.steps),
+            position=p,
+            steps=self.steps,
+            depth=self.depth,
+            memo_bytes=self.memo_bytes,
+        )
+
+
+class Span(object):
+    """
+    A lightweight reference to the characters between offsets ``start`` and
+    ``end`` in the string ``s``.  The substring is only built when ``text`` is
+    accessed.  If a function ``f`` is given, ``value`` lazily applies it to the
+    text and caches the result.
+    """
+    __slots__ = ('_s', 'start', 'end', '_f', '_value')
+
+    def __init__(self, s, start, end, f=None):
+        self._s = s
+        self.start = start
+        self.end = end
+        self._f = f
+
+    @property
+    def text(self):
+        return self._s[self.start:self.end]
+
+    @property
+    def value(self):
+        if self._f is None:
+            return self.text
+
+        try:
+            return self._value
+        except AttributeError:
+            self._value = self._f(self.text)
+            return self._value
+
+    def __eq__(self, other):
+        if isinstance(other, Span):
+            return self.text == other.text
+
+        return self.text == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        # Equal to its text, so it must hash the same
+        return hash(self.text)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return 'Span({0!r}, {1}, {2})'.format(self.text, self.start, self.end)
+
+    def __len__(self):
+        return self.end - self.start
+
+
 class CursorString(object):
-    def __init__(self, s, line=1, col=1):
+    """
+    A cursor at offset ``i`` in the string ``s``.  Reading from a cursor string
+    returns the characters read and a new cursor after them.  The source string
+    and parse ``context`` are shared between cursors rather than copied.
+    """
+    def __init__(self, s, line=1, col=1, i=0, context=None):
         self._s = s
         self._line = line
         self._col = col
+        self._i = i
+        self.context = context
 
     @property
     def position(self):
         return self._line, self._col
 
+    @property
+    def offset(self):
+        return self._i
+
     def __eq__(self, other):
         if isinstance(other, CursorString):
-            return self._s == other._s
+            return str(self) == str(other)
 
-        return self._s == other
+        return str(self) == other
 
     def __str__(self):
-        return self._s
+        return self._s[self._i:]
 
     def __len__(self):
-        return len(self._s)
+        return len(self._s) - self._i
 
-    def read(self, n=None):
-        s = self._s
+    def startswith(self, prefix):
+        return self._s.startswith(prefix, self._i)
+
+    def find(self, sub):
+        """
+        Returns the number of chars before the first occurrence of ``sub`` in
+        the unread string or -1 if it does not occur.
+        """
+        j = self._s.find(sub, self._i)
+        return j - self._i if j != -1 else -1
+
+    def match(self, pattern):
+        """
+        Matches the compiled regular expression ``pattern`` at the cursor.
+        """
+        return pattern.match(self._s, self._i)
+
+    def scan(self, f):
+        """
+        Returns the number of chars at the front of the unread string for which
+        the predicate ``f`` returns ``True``.
+        """
+        s, i = self._s, self._i
+        n = len(s)
+
+        j = i
+        while j < n and f(s[j]):
+            j += 1
+
+        return j - i
 
-        if len(s) == 0:
+    def span(self, other, f=None):
+        """
+        Returns a span of the characters between this cursor and the cursor
+        ``other`` further along the same string.
+        """
+        return Span(self._s, self._i, other._i, f)
+
+    def head(self, n):
+        """
+        Returns at most ``n`` chars from the front of the unread string.
+        """
+        return self._s[self._i:self._i + n]
+
+    def advance(self, n=None):
+        """
+        Returns a cursor ``n`` chars further along the string without building
+        the chars passed over.
+        """
+        s, i = self._s, self._i
+        remaining = len(s) - i
+
+        if remaining == 0:
             raise EndOfStringError('End of string reached')
 
         if n is None:
-            x, xs = s, ''
+            n = remaining
         elif n < 0:
             raise ValueError('Cannot read negative amount of chars from string')
-        else:
-            x, xs = s[:n], s[n:]
 
-        if len(x) < n:
-            raise EndOfStringError('End of string reached', x)
+        if n > remaining:
+            raise EndOfStringError('End of string reached', s[i:])
 
-        ls = x.split('\n')
-        dl, dc = len(ls) - 1, len(ls[-1])
+        j = i + n
+        dl = s.count('\n', i, j)
 
-        return (x, type(self)(
-            xs,
+        return type(self)(
+            s,
             self._line + dl,
-            self._col + dc if dl == 0 else 1 + dc,
+            self._col + n if dl == 0 else j - s.rfind('\n', i, j),
+            j,
+            self.context,
+        )
+
+    def read(self, n=None):
+        xs = self.advance(n)
+
+        return (self._s[self._i:xs._i], xs)
+
+    def get_error(self, ErrorClass, msg):
+        p = self.position
+
+        return ErrorClass('At line {0}, col {1}: {2}'.format(
+            p[0], p[1], msg,
         ))
 
+
+class LimitedCursorString(CursorString):
+    """
+    A cursor string which counts each search of and move along the string as
+    a step of its parse context.  Used instead of ``CursorString`` when the
+    context is limited, so that unlimited parses pay nothing for the limits.
+    """
+    def startswith(self, prefix):
+        self.context.step(self)
+        return super(LimitedCursorString, self).startswith(prefix)
+
+    def find(self, sub):
+        self.context.step(self)
+        return super(LimitedCursorString, self).find(sub)
+
+    def match(self, pattern):
+        self.context.step(self)
+        return super(LimitedCursorString, self).match(pattern)
+
+    def scan(self, f):
+        self.context.step(self)
+        return super(LimitedCursorString, self).scan(f)
+
+    def advance(self, n=None):
+        self.context.step(self)
+        return super(LimitedCursorString, self).advance(n)
+
+
+class TokenStream(object):
+    """
+    A cursor over the tokens produced by a lexer for the source string ``s``.
+    Each token is a ``(kind, start, end)`` tuple of offsets into ``s``.  Reading
+    from a token stream returns a tuple of tokens and a new stream positioned
+    after them, which allows the usual combinators to run over tokens instead
+    of characters.
+    """
+    def __init__(self, s, tokens, i=0, context=None, lines=None):
+        self._s = s
+        self._tokens = tokens
+        self._i = i
+        self.context = context
+
+        # Line starts are found once and shared by all streams over ``s``
+        self._lines = line_starts(s) if lines is None else lines
+
+    @property
+    def position(self):
+        offset = self._start()
+        line = bisect.bisect_right(self._lines, offset)
+
+        return line, offset - self._lines[line - 1] + 1
+
+    @property
+    def offset(self):
+        return self._i
+
+    @property
+    def tokens(self):
+        return tuple(self._tokens[self._i:])
+
+    def __eq__(self, other):
+        if isinstance(other, TokenStream):
+            return [self.text(t) for t in self.tokens] == [other.text(t) for t in other.tokens]
+
+        return self.tokens == tuple(other)
+
+    def __str__(self):
+        return self._s[self._start():]
+
+    def _start(self):
+        tokens, i = self._tokens, self._i
+
+        return tokens[i][1] if i < len(tokens) else len(self._s)
+
+    def head(self, n):
+        """
+        Returns at most ``n`` chars of the source string from the next token.
+        """
+        start = self._start()
+
+        return self._s[start:start + n]
+
+    def __len__(self):
+        return len(self._tokens) - self._i
+
+    def text(self, token):
+        """
+        Returns the text in the source string covered by ``token``.
+        """
+        return self._s[token[1]:token[2]]
+
+    def span(self, other, f=None):
+        """
+        Returns a span of the source string covered by the tokens between this
+        stream and the stream ``other`` further along the same tokens.
+        """
+        tokens, i, j = self._tokens, self._i, other._i
+
+        if j == i:
+            start = end = self._start()
+        else:
+            start, end = tokens[i][1], tokens[j - 1][2]
+
+        return Span(self._s, start, end, f)
+
+    def advance(self, n=None):
+        """
+        Returns a stream ``n`` tokens further along without building the tuple
+        of tokens passed over.
+        """
+        tokens, i = self._tokens, self._i
+        remaining = len(tokens) - i
+
+        if remaining == 0:
+            raise EndOfStringError('End of tokens reached')
+
+        if n is None:
+            n = remaining
+        elif n < 0:
+            raise ValueError('Cannot read negative amount of tokens from stream')
+
+        if n > remaining:
+            raise EndOfStringError('End of tokens reached', tuple(tokens[i:]))
+
+        return type(self)(self._s, tokens, i + n, self.context, self._lines)
+
+    def read(self, n=None):
+        tokens, i = self._tokens, self._i
+        remaining = len(tokens) - i
+
+        if remaining == 0:
+            raise EndOfStringError('End of tokens reached')
+
+        if n is None:
+            n = remaining
+        elif n < 0:
+            raise ValueError('Cannot read negative amount of tokens from stream')
+
+        x = tuple(tokens[i:i + n])
+
+        if len(x) < n:
+            raise EndOfStringError('End of tokens reached', x)
+
+        return (x, type(self)(self._s, tokens, i + n, self.context, self._lines))
+
     def get_error(self, ErrorClass, msg):
         p = self.position
 
         return ErrorClass('At line {0}, col {1}: {2}'.format(
             p[0], p[1], msg,
         ))
+
+
+class LimitedTokenStream(TokenStream):
+    """
+    A token stream which counts each move along the tokens as a step of its
+    parse context.  Used instead of ``TokenStream`` when the context is
+    limited.
+    """
+    def advance(self, n=None):
+        self.context.step(self)
+        return super(LimitedTokenStream, self).advance(n)
+
+    def read(self, n=None):
+        self.context.step(self)
+        return super(LimitedTokenStream, self).read(n)
@@ -0,0 +1,182 @@
+from __future__ import unicode_literals
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .exceptions import NotEnoughInputError, ImproperInputError
+from .parsers import Parser
+from .streams import EndOfStringError
+from .utils import truncate
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError('NumPy is required for vectorised table parsing')
+
+
+def codes(s):
+    """
+    Returns the code points of the string ``s`` as an array.  Offsets into the
+    array are the same as offsets into ``s``.
+    """
+    return np.frombuffer(s.encode('utf-32-le'), dtype=np.uint32)
+
+
+def positive_integers(cs, starts, ends):
+    """
+    Converts the fields of the code point array ``cs`` delimited by the offset
+    arrays ``starts`` and ``ends`` into an array of integers in one batch.
+    Raises a ``ValueError`` if any field is empty, too long or contains a
+    character which is not a digit.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    widths = ends - starts
+    if (widths < 1).any():
+        raise ValueError('Cannot convert empty field to integer')
+
+    w = int(widths.max())
+    if w > 18:
+        raise ValueError('Cannot convert field of more than 18 digits to integer')
+
+    idx = starts[:, None] + np.arange(w)
+    mask = idx < ends[:, None]
+
+    digits = cs[np.where(mask, idx, 0)].astype(np.int64) - ord('0')
+    if ((digits < 0) | (digits > 9))[mask].any():
+        raise ValueError('Cannot convert non-digit field to integer')
+
+    exponents = np.where(mask, ends[:, None] - 1 - idx, 0)
+
+    return (np.where(mask, digits, 0) * 10 ** exponents).sum(axis=1)
+
+
+class Delimited(Parser):
+    """
+    Constructs a parser which splits the rest of the input into records
+    separated by ``record_sep`` and fields separated by ``field_sep``.  The
+    whole input is classified at once with vectorised NumPy operations.  The
+    result is a pair of ``(starts, ends)`` arrays of shape ``(records,
+    fields)`` holding the offset of each field in the source string, the same
+    offsets used by cursors and spans.  A single trailing record separator is
+    ignored.
+    """
+    def __init__(self, field_sep=',', record_sep='\n'):
+        require_numpy()
+
+        if len(field_sep) != 1 or len(record_sep) != 1:
+            raise ValueError('Separators must be single characters')
+
+        if field_sep == record_sep:
+            raise ValueError('Field and record separators must differ')
+
+        self.field_sep = field_sep
+        self.record_sep = record_sep
+
+    def offsets(self, xs, cs):
+        n = len(cs)
+        rsep = ord(self.record_sep)
+        fsep = ord(self.field_sep)
+
+        if cs[n - 1] == rsep:
+            n -= 1
+            cs = cs[:n]
+
+        is_rsep = cs == rsep
+        bounds = np.flatnonzero(is_rsep | (cs == fsep))
+
+        starts = np.concatenate(([0], bounds + 1))
+        ends = np.concatenate((bounds, [n]))
+
+        n_records = int(is_rsep.sum()) + 1
+        n_fields = len(starts) // n_records
+
+        if n_fields * n_records != len(starts) or not is_rsep[ends[n_fields - 1:-1:n_fields]].all():
+            raise xs.get_error(ImproperInputError, 'Records do not all have the same number of fields in string "{0}"'.format(
+                truncate(xs),
+            ))
+
+        return (
+            starts.reshape(n_records, n_fields),
+            ends.reshape(n_records, n_fields),
+        )
+
+    def fields(self, xs):
+        """
+        Reads the rest of the input ``xs`` and returns the text read, its code
+        points, the field offsets relative to the text and the stream after it.
+        """
+        try:
+            s, xs_ = xs.read()
+        except EndOfStringError:
+            raise xs.get_error(NotEnoughInputError, 'Expected delimited records')
+
+        cs = codes(s)
+        starts, ends = self.offsets(xs, cs)
+
+        return (s, cs, starts, ends, xs_)
+
+    def parse(self, xs):
+        _, _, starts, ends, xs_ = self.fields(xs)
+
+        return ((starts + xs.offset, ends + xs.offset), xs_)
+
+
+class Table(Delimited):
+    """
+    Constructs a delimited parser which returns a tuple of columns.  Each
+    column is converted with the corresponding function in ``columns``.  Columns
+    converted with ``int`` are converted in batch by ``positive_integers`` into
+    an array, falling back to ``int`` on each field if any field is not a plain
+    run of digits.  Other functions are applied to each field.  A ``None``
+    converter leaves fields as strings.
+    """
+    def __init__(self, columns, field_sep=',', record_sep='\n'):
+        super(Table, self).__init__(field_sep, record_sep)
+
+        self.columns = tuple(columns)
+
+    def parse(self, xs):
+        s, cs, starts, ends, xs_ = self.fields(xs)
+
+        if starts.shape[1] != len(self.columns):
+            raise xs.get_error(ImproperInputError, 'Expected {0} field(s) per record in string "{1}"'.format(
+                len(self.columns),
+                truncate(xs),
+            ))
+
+        result = []
+        for j, f in enumerate(self.columns):
+            a, b = starts[:, j], ends[:, j]
+
+            if f is int:
+                try:
+                    column = positive_integers(cs, a, b)
+                except ValueError:
+                    # Signs, spaces and long numbers are left to ``int``
+                    column = np.asarray(self.convert(xs, int, s, a, b, j))
+            else:
+                column = self.convert(xs, f, s, a, b, j)
+
+            result.append(column)
+
+        return (tuple(result), xs_)
+
+    def convert(self, xs, f, s, starts, ends, j):
+        """
+        Converts the fields of column ``j`` one at a time with ``f``.
+        """
+        column = [s[i:k] for i, k in zip(starts.tolist(), ends.tolist())]
+        if f is None:
+            return column
+
+        try:
+            return [f(x) for x in column]
+        except ValueError as e:
+            raise xs.get_error(ImproperInputError, '{0} in column {1}'.format(e, j))
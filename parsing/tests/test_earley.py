@@ -0,0 +1,111 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ..basic import alphas, digits, positive_integer
+from ..earley import Earley
+from ..exceptions import ImproperInputError, PlaceholderError
+from ..lexer import Lexer, Kind
+from ..parsers import (
+    Literal, Sequence, Alternatives, Placeholder, Optional, Discard, Apply,
+    Token, TakeAll, First,
+)
+
+
+class TestEarley(unittest.TestCase):
+    def test_it_should_parse_like_the_recursive_descent_parsers(self):
+        p = Sequence(
+            Token(alphas),
+            Discard(Token(Literal('='))),
+            Alternatives(positive_integer, alphas),
+            Optional(Literal(';')),
+        )
+
+        for s in ('arst = 1234;', 'arst = 1234', 'arst=yo'):
+            self.assertEqual(Earley(p).parse_string(s), p.parse_string(s))
+
+    def test_it_should_prefer_earlier_alternatives(self):
+        p = Alternatives(
+            Apply(lambda x: ('first', x), digits),
+            Apply(lambda x: ('second', x), digits),
+        )
+
+        self.assertEqual(Earley(p).parse_string('12'), (('first', '12'), ''))
+
+    def test_it_should_follow_ordered_choice(self):
+        p = Alternatives(Literal('a'), Literal('ab'))
+
+        for s in ('ab', 'abc', 'a'):
+            self.assertEqual(Earley(p).parse_string(s), p.parse_string(s))
+
+    def test_it_should_follow_ordered_choice_in_nested_parsers(self):
+        p = Sequence(Sequence(Alternatives(Literal('a'), Literal('ab'))), Optional(Literal('b')))
+
+        for s in ('ab', 'abb', 'a'):
+            self.assertEqual(Earley(p).parse_string(s), p.parse_string(s))
+
+    def test_it_should_try_token_separators_after_the_choices_of_the_token(self):
+        p = Token(Alternatives(Literal('a'), Literal('aa')), Literal('b'))
+
+        self.assertEqual(Earley(p).parse_string('aabbb'), p.parse_string('aabbb'))
+
+    def test_it_should_repeat_take_all_items_in_ordered_choice(self):
+        p = TakeAll(Sequence(Literal('a'), Alternatives(Literal('a'), Literal('aa'))))
+
+        for s in ('aaa', 'aaaa', 'aaab'):
+            self.assertEqual(Earley(p).parse_string(s), p.parse_string(s))
+
+    def test_it_should_parse_take_all_parsers(self):
+        p = TakeAll(Token(alphas))
+
+        self.assertEqual(Earley(p).parse_string('ab cd ef 12'), (('ab', 'cd', 'ef'), '12'))
+
+    def test_it_should_parse_recursive_grammars(self):
+        parens = Placeholder()
+        parens.set(Sequence(Literal('('), Optional(parens), Literal(')')))
+
+        self.assertEqual(Earley(parens).parse_string('(())'), (('(', ('(', ')'), ')'), ''))
+
+    def test_it_should_handle_left_recursion(self):
+        expr = Placeholder()
+        expr.set(Alternatives(
+            Apply(lambda t: t[0] - t[1], Sequence(expr, Discard('-'), positive_integer)),
+            positive_integer,
+        ))
+
+        self.assertEqual(Earley(expr).parse_string('10-4-3'), (3, ''))
+
+    def test_it_should_parse_pathological_grammars_in_polynomial_time(self):
+        # Backtracking re-parses ``s`` for each alternative at every level,
+        # which takes exponential time in the nesting depth
+        s = Placeholder()
+        s.set(Alternatives(
+            Sequence(Literal('a'), s, Literal('b')),
+            Sequence(Literal('a'), s, Literal('c')),
+            Literal('a'),
+        ))
+
+        x, xs = Earley(s).parse_string('a' * 21 + 'c' * 20 + 'x')
+
+        self.assertEqual(xs, 'x')
+        for _ in range(20):
+            self.assertEqual(x[2], 'c')
+            x = x[1]
+
+        self.assertEqual(x, 'a')
+
+    def test_it_should_parse_token_streams(self):
+        lexer = Lexer([('NAME', r'[a-z]+'), ('SPACE', r'\s+')], skip=['SPACE'])
+        p = TakeAll(Kind('NAME'))
+
+        self.assertEqual(Earley(p).parse_tokens('ab cd', lexer), (('ab', 'cd'), lexer.stream('')))
+
+    def test_it_should_raise_an_error_if_parsing_fails(self):
+        p = Sequence(alphas, digits)
+
+        with self.assertRaises(ImproperInputError):
+            Earley(p).parse_string('arst arst')
+
+    def test_it_should_raise_an_error_for_unset_placeholders(self):
+        with self.assertRaises(PlaceholderError):
+            Earley(First(Placeholder()))
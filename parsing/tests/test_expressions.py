@@ -0,0 +1,73 @@
+from __future__ import unicode_literals
+
+import operator
+import unittest
+
+from ..basic import positive_integer
+from ..exceptions import ImproperInputError
+from ..expressions import Expression, PREFIX, POSTFIX, LEFT, RIGHT
+from ..parsers import Placeholder, Discard, First, Sequence, Token, Literal
+
+
+def factorial(n):
+    return 1 if n <= 1 else n * factorial(n - 1)
+
+
+class TestExpression(unittest.TestCase):
+    def setUp(self):
+        expression = Placeholder()
+
+        atom = Token(positive_integer) | First(Sequence(
+            Discard(Token(Literal('('))),
+            expression,
+            Discard(Token(Literal(')'))),
+        ))
+
+        def op(s):
+            return Token(Literal(s))
+
+        expression.set(Expression(atom, [
+            ([(op('!'), factorial)], POSTFIX),
+            ([(op('-'), operator.neg)], PREFIX),
+            ([(op('^'), operator.pow)], RIGHT),
+            ([(op('*'), operator.mul), (op('/'), operator.floordiv)], LEFT),
+            ([(op('+'), operator.add), (op('-'), operator.sub)], LEFT),
+        ]))
+
+        self.p = expression
+
+    def test_it_should_parse_a_single_atom(self):
+        self.assertEqual(self.p.parse_string('12'), (12, ''))
+
+    def test_it_should_respect_precedence_levels(self):
+        self.assertEqual(self.p.parse_string('1 + 2 * 3'), (7, ''))
+        self.assertEqual(self.p.parse_string('1 * 2 + 3'), (5, ''))
+        self.assertEqual(self.p.parse_string('(1 + 2) * 3'), (9, ''))
+        self.assertEqual(self.p.parse_string('2 * 3 ^ 2'), (18, ''))
+
+    def test_it_should_respect_associativity(self):
+        self.assertEqual(self.p.parse_string('10 - 4 - 3'), (3, ''))
+        self.assertEqual(self.p.parse_string('100 / 10 / 5'), (2, ''))
+        self.assertEqual(self.p.parse_string('2 ^ 3 ^ 2'), (512, ''))
+
+    def test_it_should_apply_prefix_and_postfix_operators(self):
+        self.assertEqual(self.p.parse_string('-3 + 5'), (2, ''))
+        self.assertEqual(self.p.parse_string('3! * 2'), (12, ''))
+        self.assertEqual(self.p.parse_string('- - 3'), (3, ''))
+        self.assertEqual(self.p.parse_string('1 - -3'), (4, ''))
+
+    def test_it_should_leave_a_dangling_operator_unparsed(self):
+        self.assertEqual(self.p.parse_string('1 + 2 +'), (3, '+'))
+
+    def test_it_should_raise_an_error_if_no_expression_is_found(self):
+        with self.assertRaises(ImproperInputError):
+            self.p.parse_string('* 2')
+
+    def test_it_should_accept_strings_as_operators(self):
+        p = Expression(positive_integer, [([('+', operator.add)], LEFT)])
+
+        self.assertEqual(p.parse_string('1+2+3'), (6, ''))
+
+    def test_it_should_reject_unknown_operator_kinds(self):
+        with self.assertRaises(ValueError):
+            Expression(positive_integer, [([('+', operator.add)], 'infix')])
@@ -0,0 +1,97 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ..exceptions import LexError, NotEnoughInputError, ImproperInputError, ParseLimitExceeded
+from ..lexer import Lexer, Kind
+from ..parsers import Sequence, Alternatives, TakeAll, TakeItems, TakeWhile, TakeUntil, Token, Apply
+from ..streams import TokenStream
+
+
+lexer = Lexer([
+    ('LET', r'let\b'),
+    ('NAME', r'[a-z]+'),
+    ('NUMBER', r'\d+'),
+    ('EQUALS', r'='),
+    ('SPACE', r'\s+'),
+], skip=['SPACE'])
+
+
+class TestLexer(unittest.TestCase):
+    def test_it_should_tokenize_a_string_into_kinds_and_offsets(self):
+        self.assertEqual(lexer.tokenize('let x = 12'), [
+            ('LET', 0, 3),
+            ('NAME', 4, 5),
+            ('EQUALS', 6, 7),
+            ('NUMBER', 8, 10),
+        ])
+
+    def test_it_should_prefer_earlier_rules(self):
+        self.assertEqual(lexer.tokenize('letter'), [('NAME', 0, 6)])
+
+    def test_it_should_raise_an_error_for_unrecognized_input(self):
+        with self.assertRaises(LexError):
+            lexer.tokenize('let x\n= ?')
+
+        try:
+            lexer.tokenize('let x\n= ?')
+        except LexError as e:
+            self.assertTrue(str(e).startswith('At line 2, col 3'))
+
+    def test_it_should_produce_a_token_stream(self):
+        xs = lexer.stream('let x')
+
+        self.assertIsInstance(xs, TokenStream)
+        self.assertEqual(xs, [('LET', 0, 3), ('NAME', 4, 5)])
+
+
+class TestKind(unittest.TestCase):
+    def test_it_should_parse_a_token_of_the_given_kind(self):
+        self.assertEqual(Kind('NAME').parse_tokens('x = 1', lexer), ('x', lexer.stream('= 1')))
+
+    def test_it_should_raise_an_error_if_parsing_fails(self):
+        with self.assertRaises(ImproperInputError):
+            Kind('NAME').parse_tokens('1', lexer)
+
+        with self.assertRaises(NotEnoughInputError):
+            Kind('NAME').parse_tokens('', lexer)
+
+    def test_it_should_combine_with_other_parsers(self):
+        statement = Sequence(
+            Kind('LET'),
+            Kind('NAME'),
+            Kind('EQUALS'),
+            Apply(int, Kind('NUMBER') | Kind('NAME')),
+        )
+
+        self.assertEqual(
+            TakeAll(statement).parse_tokens('let x = 1 let y = 2', lexer),
+            ((('let', 'x', '=', 1), ('let', 'y', '=', 2)), lexer.stream('')),
+        )
+
+        p = Alternatives(Kind('NUMBER'), TakeItems(2))
+        self.assertEqual(p.parse_tokens('x = 1', lexer)[0], (('NAME', 0, 1), ('EQUALS', 2, 3)))
+
+    def test_it_should_run_take_parsers_over_tokens(self):
+        is_name = lambda ts: ts[0][0] == 'NAME'
+
+        self.assertEqual(
+            TakeWhile(is_name).parse_tokens('ab cd 1', lexer),
+            ((('NAME', 0, 2), ('NAME', 3, 5)), lexer.stream('1')),
+        )
+        self.assertEqual(
+            TakeUntil(Kind('NUMBER')).parse_tokens('ab cd 1', lexer)[0],
+            (('NAME', 0, 2), ('NAME', 3, 5)),
+        )
+
+        with self.assertRaises(ImproperInputError):
+            TakeUntil(Kind('NUMBER')).parse_tokens('ab cd', lexer)
+
+    def test_it_should_not_skip_whitespace_in_token_streams_by_default(self):
+        p = TakeAll(Token(Kind('NAME')))
+
+        self.assertEqual(p.parse_tokens('ab cd', lexer), (('ab', 'cd'), lexer.stream('')))
+
+    def test_it_should_apply_parse_limits(self):
+        with self.assertRaises(ParseLimitExceeded):
+            TakeAll(Kind('NAME')).parse_tokens('a b c d', lexer, max_steps=3)
@@ -1,14 +1,23 @@
 from __future__ import unicode_literals
 
+from collections import namedtuple
+import sys
 import unittest
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # pragma: no cover
+    ThreadPoolExecutor = None
+
 from ..basic import digits, alphas, spaces, positive_integer
-from ..exceptions import NotEnoughInputError, ImproperInputError, PlaceholderError
+from ..exceptions import NotEnoughInputError, ImproperInputError, PlaceholderError, ParseLimitExceeded
 from ..parsers import (
     TakeItems, TakeItemsIf, TakeWhile, TakeUntil, Token, TakeIf, TakeAll,
     Apply, Literal, Discardable, Discard, Sequence, Optional, Alternatives,
-    Placeholder, First,
+    Placeholder, First, Spanned, Collect, Flatten, Join, Regex, Cached, Memoize,
+    Many, SepBy, Count,
 )
+from ..streams import CursorString
 from ..utils import compose, flatten, join, is_alpha, unary, equals
 
 
@@ -36,6 +45,59 @@ class TestParserBuilding(unittest.TestCase):
         )
 
 
+class TestInterning(unittest.TestCase):
+    def test_it_should_share_parsers_built_with_the_same_arguments(self):
+        self.assertIs(Literal('a'), Literal('a'))
+        self.assertIs(Token(Literal(',')), Token(Literal(',')))
+        self.assertIs(Discard(','), Discard(','))
+        self.assertIs(TakeWhile(is_alpha), alphas)
+
+    def test_it_should_distinguish_parsers_built_with_different_arguments(self):
+        self.assertIsNot(Literal('a'), Literal('b'))
+        self.assertIsNot(TakeItems(1), TakeItems(True))
+        self.assertIsNot(Token(alphas), Token(alphas, digits))
+        self.assertIsNot(Sequence(alphas, digits), Alternatives(alphas, digits))
+
+    def test_it_should_not_share_parsers_with_mutable_state(self):
+        self.assertIsNot(Placeholder(), Placeholder())
+        self.assertIsNot(Cached(alphas), Cached(alphas))
+
+    def test_it_should_not_share_parsers_built_with_unhashable_arguments(self):
+        self.assertIsNot(Sequence([alphas]), Sequence([alphas]))
+
+    def test_it_should_not_initialize_shared_parsers_again(self):
+        # Use a literal no other test builds, since interned parsers are shared
+        # by the whole process
+        p = Literal('not initialized again')
+        p.marker = True
+        self.addCleanup(delattr, p, 'marker')
+
+        self.assertTrue(Literal('not initialized again').marker)
+
+
+class TestParseBatch(unittest.TestCase):
+    def setUp(self):
+        self.p = TakeAll(Token(positive_integer))
+        self.inputs = ['{0} {1}'.format(i, i + 1) for i in range(100)]
+
+    def test_it_should_parse_each_input(self):
+        self.assertEqual(
+            self.p.parse_batch(self.inputs[:2]),
+            [((0, 1), ''), ((1, 2), '')],
+        )
+
+    @unittest.skipIf(ThreadPoolExecutor is None, 'concurrent.futures is not available')
+    def test_it_should_parse_inputs_with_the_given_executor(self):
+        with ThreadPoolExecutor(4) as executor:
+            results = self.p.parse_batch(self.inputs, executor=executor)
+
+        self.assertEqual(results, self.p.parse_batch(self.inputs))
+
+    def test_it_should_raise_parse_errors(self):
+        with self.assertRaises(ImproperInputError):
+            self.p.parse_batch(['1 2', 'arst'])
+
+
 class TestTakeItems(unittest.TestCase):
     def test_it_should_parse_the_given_number_of_characters(self):
         p = TakeItems(3)
@@ -117,6 +179,25 @@ class TestTakeUntil(unittest.TestCase):
             self.p.parse_string('arst')
 
 
+class TestRegex(unittest.TestCase):
+    def setUp(self):
+        self.p = Regex(r'[a-z]+\d*')
+
+    def test_it_should_parse_text_matching_the_given_pattern(self):
+        self.assertEqual(self.p.parse_string('arst12 arst'), ('arst12', ' arst'))
+
+    def test_it_should_raise_an_error_if_parsing_fails(self):
+        with self.assertRaises(ImproperInputError):
+            self.p.parse_string('12arst')
+
+        with self.assertRaises(NotEnoughInputError):
+            self.p.parse_string('')
+
+    def test_it_should_raise_an_error_for_empty_matches(self):
+        with self.assertRaises(ImproperInputError):
+            Regex(r'\d*').parse_string('arst')
+
+
 class TestToken(unittest.TestCase):
     def test_it_should_parse_using_the_given_parser_and_consume_whitespace(self):
         p = Token(alphas)
@@ -150,6 +231,78 @@ class TestTakeAll(unittest.TestCase):
             self.p.parse_string('1234 arst')
 
 
+class TestMany(unittest.TestCase):
+    def setUp(self):
+        self.p = Token(alphas)
+
+    def test_it_should_parse_any_number_of_items_by_default(self):
+        self.assertEqual(Many(self.p).parse_string('ab cd 12'), (('ab', 'cd'), '12'))
+        self.assertEqual(Many(self.p).parse_string('12'), ((), '12'))
+
+    def test_it_should_require_the_minimum_number_of_items(self):
+        self.assertEqual(Many(self.p, min=2).parse_string('ab cd'), (('ab', 'cd'), ''))
+
+        with self.assertRaises(ImproperInputError):
+            Many(self.p, min=2).parse_string('ab 12')
+
+    def test_it_should_stop_at_the_maximum_number_of_items(self):
+        self.assertEqual(Many(self.p, max=2).parse_string('ab cd ef'), (('ab', 'cd'), 'ef'))
+
+    def test_it_should_stop_if_no_input_is_consumed(self):
+        self.assertEqual(Many(Optional(digits)).parse_string('ab'), ((Discardable(None),), 'ab'))
+
+    def test_it_should_require_valid_bounds(self):
+        with self.assertRaises(ValueError):
+            Many(self.p, min=-1)
+
+        with self.assertRaises(ValueError):
+            Many(self.p, min=2, max=1)
+
+
+class TestSepBy(unittest.TestCase):
+    def test_it_should_parse_items_separated_by_the_given_parser(self):
+        p = SepBy(positive_integer, ',')
+
+        self.assertEqual(p.parse_string('1,22,333'), ((1, 22, 333), ''))
+        self.assertEqual(p.parse_string('1,22,'), ((1, 22), ','))
+        self.assertEqual(p.parse_string('arst'), ((), 'arst'))
+
+    def test_it_should_optionally_consume_a_trailing_separator(self):
+        p = SepBy(positive_integer, Token(Literal(',')), trailing=True)
+
+        self.assertEqual(p.parse_string('1, 22, ]'), ((1, 22), ']'))
+        self.assertEqual(p.parse_string('1, 22]'), ((1, 22), ']'))
+
+    def test_it_should_stop_if_no_input_is_consumed(self):
+        p = SepBy(Many(digits), Optional(Literal(',')))
+
+        self.assertEqual(p.parse_string('a'), (((), ()), 'a'))
+        self.assertEqual(p.parse_string('1,2a'), ((('1',), ('2',), ()), 'a'))
+
+    def test_it_should_parse_long_lists(self):
+        p = SepBy(positive_integer, ',')
+        n = 10000
+
+        x, xs = p.parse_string(','.join(['1'] * n))
+        self.assertEqual(len(x), n)
+
+
+class TestCount(unittest.TestCase):
+    def test_it_should_parse_exactly_n_items(self):
+        p = Count(Token(alphas), 2)
+
+        self.assertEqual(p.parse_string('ab cd ef'), (('ab', 'cd'), 'ef'))
+        self.assertEqual(Count(alphas, 0).parse_string('ab'), ((), 'ab'))
+
+    def test_it_should_raise_an_error_if_too_few_items_are_parsed(self):
+        with self.assertRaises(ImproperInputError):
+            Count(Token(alphas), 3).parse_string('ab cd 12')
+
+    def test_it_should_require_a_non_negative_number(self):
+        with self.assertRaises(ValueError):
+            Count(alphas, -1)
+
+
 class TestPositiveInteger(unittest.TestCase):
     def test_it_should_parse_digits_and_return_a_number(self):
         self.assertEqual(positive_integer.parse_string('1234 arst'), (1234, ' arst'))
@@ -165,6 +318,9 @@ class TestLiteral(unittest.TestCase):
         with self.assertRaises(ImproperInputError):
             Literal('arst').parse_string('ars1234')
 
+        with self.assertRaises(NotEnoughInputError):
+            Literal('arst').parse_string('ars')
+
 
 class TestSequence(unittest.TestCase):
     def setUp(self):
@@ -271,6 +427,106 @@ class TestDiscard(unittest.TestCase):
         self.assertEqual(Discard('arst').parse_string('arst'), (Discardable('arst'), ''))
 
 
+class TestSpanned(unittest.TestCase):
+    def test_it_should_return_a_span_of_the_consumed_input(self):
+        x, xs = Spanned(alphas & digits).parse_string('arst1234 arst')
+
+        self.assertEqual((x.start, x.end), (0, 8))
+        self.assertEqual(x.text, 'arst1234')
+        self.assertEqual(xs, ' arst')
+
+    def test_it_should_lazily_apply_the_given_function(self):
+        x, _ = Spanned(digits, int).parse_string('1234 arst')
+
+        self.assertEqual(x.value, 1234)
+
+    def test_it_should_not_build_results_of_the_given_parser(self):
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return x
+
+        p = Spanned(Sequence(
+            Apply(f, Token(alphas)),
+            Discard('='),
+            Optional(Literal('-')),
+            TakeAll(Token(positive_integer)),
+            TakeUntil(';'),
+            Regex(r';+'),
+        ))
+
+        x, xs = p.parse_string('arst =12 34 x;; yo')
+
+        self.assertEqual(x.text, 'arst =12 34 x;;')
+        self.assertEqual(xs, ' yo')
+        self.assertEqual(calls, [])
+
+        p = Spanned(SepBy(Apply(f, digits), Apply(f, Literal(','))))
+
+        self.assertEqual(p.parse_string('1,2,3')[0].text, '1,2,3')
+        self.assertEqual(calls, [])
+
+    def test_it_should_advance_like_the_given_parser(self):
+        ps = [
+            TakeItems(2), Literal('ar'), TakeWhile(is_alpha), TakeUntil('1'),
+            Regex(r'\w+'), Token(alphas), alphas & digits, digits | alphas,
+            Optional(digits), Discard(alphas), First(alphas & digits),
+            TakeAll(Token(alphas)), ~TakeItemsIf(2, is_alpha),
+            Many(TakeItems(1), 2, 3), Many(Optional(digits)), Count(TakeItems(2), 2),
+            SepBy(alphas, ' '), SepBy(TakeItems(1), 'r', trailing=True),
+            SepBy(Many(digits), Optional(Literal(' '))),
+        ]
+
+        for p in ps:
+            for s in ('arst 12', 'ar12\n', '12 arst'):
+                try:
+                    _, xs = p.parse_string(s)
+                except ImproperInputError:
+                    with self.assertRaises(ImproperInputError):
+                        p.skip(CursorString(s))
+                else:
+                    xs_ = p.skip(CursorString(s))
+
+                    self.assertEqual(xs_, xs)
+                    self.assertEqual(xs_.position, xs.position)
+
+        with self.assertRaises(NotEnoughInputError):
+            TakeItems(3).skip(CursorString('ar'))
+
+
+class TestMemoize(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def f(x):
+            self.calls.append(x)
+            return x
+
+        self.p = Memoize(Apply(f, digits))
+
+    def test_it_should_parse_each_position_only_once_per_parse(self):
+        p = Alternatives(
+            self.p & Literal('a'),
+            self.p & Literal('b'),
+            self.p,
+        )
+
+        self.assertEqual(p.parse_string('12c'), ('12', 'c'))
+        self.assertEqual(self.calls, ['12'])
+
+        self.assertEqual(p.parse_string('12b'), (('12', 'b'), ''))
+        self.assertEqual(self.calls, ['12', '12'])
+
+    def test_it_should_remember_failures(self):
+        p = Alternatives(self.p & Literal('a'), self.p, alphas)
+
+        self.assertEqual(p.parse_string('arst'), ('arst', ''))
+
+        with self.assertRaises(ImproperInputError):
+            self.p.parse_string('arst')
+
+
 class TestPlaceholder(unittest.TestCase):
     def test_it_should_represent_a_parser_which_is_not_yet_defined(self):
         p = Placeholder()
@@ -311,3 +567,207 @@ class TestFirst(unittest.TestCase):
         ))
 
         self.assertEqual(double_quoted_value.parse_string('"arst"'), ('arst', ''))
+
+
+class TestCollect(unittest.TestCase):
+    def test_it_should_collect_a_nested_result_into_the_given_container(self):
+        p = Collect(alphas & (digits & alphas), set)
+
+        self.assertEqual(p.parse_string('ab12ab'), ({'ab', '12'}, ''))
+
+    def test_it_should_collect_into_a_list_by_default(self):
+        p = Collect(alphas & (digits & alphas))
+
+        self.assertEqual(p.parse_string('ab12ab'), (['ab', '12', 'ab'], ''))
+
+
+class TestFlatten(unittest.TestCase):
+    def test_it_should_return_a_flat_tuple(self):
+        p = Flatten(digits & TakeAll(Literal('.') & digits))
+
+        self.assertEqual(p.parse_string('1.2.3'), (('1', '.', '2', '.', '3'), ''))
+
+
+class TestJoin(unittest.TestCase):
+    def test_it_should_join_a_nested_result_into_a_string(self):
+        p = Join(digits & TakeAll(Literal('.') & digits))
+
+        self.assertEqual(p.parse_string('1.2.3 arst'), ('1.2.3', ' arst'))
+
+
+class TestCached(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def f(x):
+            self.calls.append(x)
+            return int(x)
+
+        self.p = Apply(f, digits).cached(maxsize=2)
+
+    def test_it_should_return_cached_results_for_repeated_inputs(self):
+        self.assertIsInstance(self.p, Cached)
+
+        self.assertEqual(self.p.parse_string('12 a'), (12, ' a'))
+        self.assertEqual(self.p.parse_string('12 a'), (12, ' a'))
+        self.assertEqual(self.calls, ['12'])
+
+        info = self.p.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_it_should_cache_failures(self):
+        for _ in range(2):
+            with self.assertRaises(ImproperInputError):
+                self.p.parse_string('arst')
+
+        self.assertEqual(self.p.cache_info().hits, 1)
+
+    def test_it_should_evict_least_recently_used_results(self):
+        self.p.parse_string('1')
+        self.p.parse_string('2')
+        self.p.parse_string('1')
+        self.p.parse_string('3')
+        self.p.parse_string('1')
+        self.p.parse_string('2')
+
+        self.assertEqual(self.calls, ['1', '2', '3', '2'])
+        self.assertEqual(self.p.cache_info().evictions, 2)
+
+    def test_it_should_not_cache_parsing_within_other_parsers(self):
+        p = TakeAll(Token(self.p))
+
+        self.assertEqual(p.parse_string('1 1'), ((1, 1), ''))
+        self.assertEqual(self.calls, ['1', '1'])
+        self.assertEqual(self.p.cache_info().currsize, 0)
+
+    def test_it_should_allow_clearing_the_cache(self):
+        self.p.parse_string('1')
+        self.p.cache_clear()
+
+        self.assertEqual(self.p.cache_info(), (0, 0, 0, 2, 0))
+
+    def test_it_should_not_share_mutable_results(self):
+        p = Collect(alphas & digits).cached()
+
+        x, _ = p.parse_string('ab12')
+        self.assertEqual(x, ('ab', '12'))
+
+        with self.assertRaises(AttributeError):
+            x.append('cd')
+
+        self.assertEqual(p.parse_string('ab12'), (('ab', '12'), ''))
+
+    def test_it_should_keep_the_type_of_named_tuples(self):
+        Num = namedtuple('Num', ['value'])
+        p = Apply(lambda s: Num(int(s)), digits).cached()
+
+        for _ in range(2):
+            self.assertEqual(p.parse_string('12')[0].value, 12)
+
+    def test_it_should_not_share_parse_contexts_between_calls(self):
+        p = alphas.cached()
+
+        _, xs = p.parse_string('ab 12 34 56', max_steps=3)
+        _, ys = p.parse_string('ab 12 34 56')
+
+        self.assertIsNot(xs, ys)
+        self.assertIsNone(ys.context)
+        self.assertEqual(ys.position, (1, 3))
+        self.assertEqual(TakeAll(Token(digits)).parse_stream(ys.advance(1)), (('12', '34', '56'), ''))
+
+    def test_it_should_require_a_positive_size(self):
+        with self.assertRaises(ValueError):
+            digits.cached(maxsize=0)
+
+
+class TestParseLimits(unittest.TestCase):
+    def setUp(self):
+        # Backtracking re-parses ``s`` for each alternative at every level
+        s = Placeholder()
+        s.set(Alternatives(
+            Sequence(Literal('a'), s, Literal('b')),
+            Sequence(Literal('a'), s, Literal('c')),
+            Literal('a'),
+        ))
+
+        self.p = s
+        self.pathological = 'a' * 30 + 'c' * 29
+
+    def test_it_should_parse_normally_within_the_limits(self):
+        self.assertEqual(
+            self.p.parse_string('aab', max_steps=100, max_depth=100, deadline=10),
+            (('a', 'a', 'b'), ''),
+        )
+
+    def test_it_should_limit_the_number_of_steps(self):
+        with self.assertRaises(ParseLimitExceeded):
+            self.p.parse_string(self.pathological, max_steps=10000)
+
+        try:
+            self.p.parse_string(self.pathological, max_steps=10000)
+        except ParseLimitExceeded as e:
+            self.assertEqual(e.steps, 10001)
+            self.assertEqual(e.position[0], 1)
+
+    def test_it_should_limit_the_nesting_depth(self):
+        with self.assertRaises(ParseLimitExceeded):
+            self.p.parse_string(self.pathological, max_depth=20)
+
+        try:
+            self.p.parse_string(self.pathological, max_depth=20)
+        except ParseLimitExceeded as e:
+            self.assertEqual(e.depth, 21)
+
+    def test_it_should_count_nested_parser_calls_as_depth(self):
+        parens = Placeholder()
+        parens.set(Sequence(Literal('('), Optional(parens), Literal(')')))
+
+        # Each pair of parens nests a placeholder, sequence and optional
+        self.assertEqual(parens.parse_string('((()))', max_depth=13)[1], '')
+
+        with self.assertRaises(ParseLimitExceeded):
+            parens.parse_string('(((())))', max_depth=13)
+
+        self.assertIsNone(sys.getprofile())
+
+    def test_it_should_limit_the_running_time(self):
+        with self.assertRaises(ParseLimitExceeded):
+            self.p.parse_string(self.pathological, deadline=0.01)
+
+    def test_it_should_limit_the_size_of_memoized_results(self):
+        p = Many(Memoize(Token(alphas)))
+
+        self.assertEqual(len(p.parse_string('ab ' * 100)[0]), 100)
+
+        with self.assertRaises(ParseLimitExceeded):
+            p.parse_string('ab ' * 100, max_memo_bytes=1000)
+
+    def test_it_should_report_exhausting_the_recursion_limit(self):
+        parens = Placeholder()
+        parens.set(Sequence(Literal('('), Optional(parens), Literal(')')))
+
+        with self.assertRaises(ParseLimitExceeded):
+            parens.parse_string('(' * 10000 + ')' * 10000)
+
+    def test_it_should_not_report_other_runtime_errors_as_recursion(self):
+        def fail(x):
+            raise RuntimeError('arst')
+
+        with self.assertRaises(RuntimeError) as cm:
+            Apply(fail, Literal('a')).parse_string('a')
+
+        self.assertNotIsInstance(cm.exception, ParseLimitExceeded)
+
+    def test_it_should_only_create_a_context_when_needed(self):
+        p = Sequence(Literal('a'), Literal('b'))
+
+        self.assertIsNone(p.get_context())
+        self.assertIsNotNone(p.get_context(max_steps=10))
+        self.assertIsNotNone(Many(Optional(Memoize(p))).get_context())
+
+    def test_it_should_pass_limits_through_other_entry_points(self):
+        with self.assertRaises(ParseLimitExceeded):
+            self.p.parse_batch([self.pathological], max_steps=100)
+
+        with self.assertRaises(ParseLimitExceeded):
+            self.p.cached().parse_string(self.pathological, max_steps=100)
@@ -1,8 +1,14 @@
 from __future__ import unicode_literals
 
+import re
 import unittest
 
-from ..streams import CursorString, EndOfStringError
+from ..streams import (
+    CursorString, TokenStream, LimitedCursorString, LimitedTokenStream, Span,
+    ParseContext, EndOfStringError,
+)
+from ..exceptions import ParseLimitExceeded
+from ..utils import is_alpha, string_types
 
 
 class TestCursorString(unittest.TestCase):
@@ -27,7 +33,7 @@ class TestCursorString(unittest.TestCase):
 
     def test_reading_should_return_chars_read_as_plain_string(self):
         x, _ = self.s.read(3)
-        self.assertIsInstance(x, basestring)
+        self.assertIsInstance(x, string_types)
 
     def test_reading_should_return_chars_unread_as_cursor_string(self):
         _, xs = self.s.read(3)
@@ -87,3 +93,203 @@ class TestCursorString(unittest.TestCase):
 
     def test_its_length_can_be_determined(self):
         self.assertEqual(len(self.s), 11)
+
+    def test_reading_chars_should_advance_offset_into_original_string(self):
+        _, xs = self.s.read(3)
+        self.assertEqual(xs.offset, 3)
+
+        _, xs = xs.read(4)
+        self.assertEqual(xs.offset, 7)
+        self.assertEqual(len(xs), 4)
+
+    def test_it_should_advance_without_reading(self):
+        xs = self.s.advance(6)
+
+        self.assertEqual(xs, '234\n\n')
+        self.assertEqual(xs.position, (2, 2))
+        self.assertEqual(xs.advance().position, (4, 1))
+
+        with self.assertRaises(EndOfStringError):
+            xs.advance(6)
+
+    def test_it_should_return_the_head_of_the_unread_string(self):
+        self.assertEqual(self.s.read(2)[1].head(4), 'st\n1')
+        self.assertEqual(self.s.read()[1].head(4), '')
+
+    def test_it_should_compare_and_search_in_place(self):
+        _, xs = self.s.read(2)
+
+        self.assertTrue(xs.startswith('st\n'))
+        self.assertFalse(xs.startswith('ar'))
+        self.assertEqual(xs.find('12'), 3)
+        self.assertEqual(xs.find('ar'), -1)
+        self.assertEqual(xs.match(re.compile(r'\w+')).group(), 'st')
+        self.assertEqual(xs.scan(is_alpha), 2)
+
+    def test_reading_chars_should_share_the_parse_context(self):
+        context = ParseContext()
+        s = CursorString('arst', context=context)
+
+        _, xs = s.read(2)
+        self.assertIs(xs.context, context)
+        self.assertIsNone(self.s.context)
+
+    def test_it_should_return_a_span_between_two_cursors(self):
+        _, a = self.s.read(2)
+        _, b = a.read(5)
+
+        span = a.span(b)
+        self.assertEqual((span.start, span.end), (2, 7))
+        self.assertEqual(span.text, 'st\n12')
+
+
+class TestParseContext(unittest.TestCase):
+    def test_it_should_only_be_limited_if_given_limits(self):
+        self.assertFalse(ParseContext().limited)
+        self.assertFalse(ParseContext(max_memo_bytes=10).limited)
+        self.assertFalse(ParseContext(max_depth=10).limited)
+        self.assertTrue(ParseContext(max_steps=10).limited)
+
+    def test_it_should_count_steps(self):
+        context = ParseContext(max_steps=2)
+        xs = CursorString('arst', context=context)
+
+        context.step(xs)
+        context.step(xs)
+
+        with self.assertRaises(ParseLimitExceeded):
+            context.step(xs)
+
+        self.assertEqual(context.steps, 3)
+
+    def test_it_should_measure_memoized_results(self):
+        context = ParseContext(max_memo_bytes=10 ** 6)
+        xs = CursorString('ab' * 1000, context=context)
+
+        context.remember('short', (True, xs.read(2)), xs)
+        short = context.memo_bytes
+
+        context.remember('long', (True, xs.read(2000)), xs)
+        self.assertGreater(context.memo_bytes - short, 2000)
+
+
+class TestLimitedStreams(unittest.TestCase):
+    def test_it_should_count_operations_on_the_input(self):
+        context = ParseContext(max_steps=3)
+        xs = LimitedCursorString('arst', context=context)
+
+        self.assertTrue(xs.startswith('a'))
+        _, xs = xs.read(1)
+        self.assertIsInstance(xs, LimitedCursorString)
+        self.assertEqual(context.steps, 2)
+
+        xs = xs.advance(1)
+        with self.assertRaises(ParseLimitExceeded):
+            xs.scan(is_alpha)
+
+    def test_it_should_count_moves_along_tokens(self):
+        context = ParseContext(max_steps=1)
+        xs = LimitedTokenStream('ab cd', [('NAME', 0, 2), ('NAME', 3, 5)], context=context)
+
+        _, xs = xs.read(1)
+        self.assertIsInstance(xs, LimitedTokenStream)
+
+        with self.assertRaises(ParseLimitExceeded):
+            xs.advance(1)
+
+
+class TestSpan(unittest.TestCase):
+    def test_it_should_refer_to_a_substring(self):
+        span = Span('arst1234', 4, 8)
+
+        self.assertEqual(span.text, '1234')
+        self.assertEqual(span, '1234')
+        self.assertEqual(span, Span('1234', 0, 4))
+        self.assertEqual(len(span), 4)
+
+    def test_it_should_hash_like_its_text(self):
+        span = Span('arst1234', 4, 8)
+
+        self.assertEqual(hash(span), hash('1234'))
+        self.assertIn(span, {'1234'})
+        self.assertEqual({span: 1}['1234'], 1)
+
+    def test_it_should_apply_its_function_lazily_and_only_once(self):
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return int(x)
+
+        span = Span('arst1234', 4, 8, f)
+        self.assertEqual(calls, [])
+
+        self.assertEqual(span.value, 1234)
+        self.assertEqual(span.value, 1234)
+        self.assertEqual(calls, ['1234'])
+
+    def test_its_value_should_be_its_text_without_a_function(self):
+        self.assertEqual(Span('arst1234', 0, 4).value, 'arst')
+
+
+class TestTokenStream(unittest.TestCase):
+    def setUp(self):
+        self.s = TokenStream('ab\ncd ef', [('W', 0, 2), ('W', 3, 5), ('W', 6, 8)])
+
+    def test_it_should_allow_reading_of_tokens_from_front_of_stream(self):
+        x, xs = self.s.read(2)
+        self.assertEqual(x, (('W', 0, 2), ('W', 3, 5)))
+        self.assertEqual(xs, [('W', 6, 8)])
+        self.assertEqual(len(xs), 1)
+
+    def test_reading_tokens_should_change_position(self):
+        self.assertEqual(self.s.position, (1, 1))
+
+        _, xs = self.s.read(1)
+        self.assertEqual(xs.position, (2, 1))
+
+        _, xs = xs.read(1)
+        self.assertEqual(xs.position, (2, 4))
+
+        _, xs = xs.read(1)
+        self.assertEqual(xs.position, (2, 6))
+
+    def test_reading_tokens_should_share_the_parse_context(self):
+        context = ParseContext()
+        s = TokenStream('ab', [('W', 0, 2)], context=context)
+
+        self.assertIs(s.read(1)[1].context, context)
+
+    def test_it_should_advance_without_reading(self):
+        xs = self.s.advance(2)
+
+        self.assertEqual(xs, [('W', 6, 8)])
+
+        with self.assertRaises(EndOfStringError):
+            xs.advance(2)
+
+    def test_it_should_return_the_head_of_the_unread_source(self):
+        _, xs = self.s.read(1)
+
+        self.assertEqual(xs.head(4), 'cd e')
+        self.assertEqual(xs.read()[1].head(4), '')
+
+    def test_it_should_return_the_text_of_a_token(self):
+        self.assertEqual(self.s.text(('W', 3, 5)), 'cd')
+
+    def test_reading_past_the_end_of_the_stream_raises_an_error(self):
+        with self.assertRaises(EndOfStringError):
+            self.s.read(4)
+
+        _, xs = self.s.read()
+        with self.assertRaises(EndOfStringError):
+            xs.read(1)
+
+    def test_it_can_be_cast_as_a_string(self):
+        self.assertEqual(str(self.s.read(1)[1]), 'cd ef')
+
+    def test_it_should_return_a_span_of_the_source_covered_by_tokens(self):
+        _, xs = self.s.read(2)
+
+        self.assertEqual(self.s.span(xs).text, 'ab\ncd')
+        self.assertEqual(self.s.span(self.s).text, '')
@@ -0,0 +1,88 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from ..exceptions import NotEnoughInputError, ImproperInputError
+from ..parsers import Literal, Sequence
+from ..table import np, codes, positive_integers, Delimited, Table
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestPositiveIntegers(unittest.TestCase):
+    def test_it_should_convert_fields_to_integers_in_batch(self):
+        s = '12,3,4567'
+
+        self.assertEqual(
+            positive_integers(codes(s), [0, 3, 5], [2, 4, 9]).tolist(),
+            [12, 3, 4567],
+        )
+
+    def test_it_should_raise_an_error_for_non_digit_fields(self):
+        with self.assertRaises(ValueError):
+            positive_integers(codes('1a'), [0], [2])
+
+        with self.assertRaises(ValueError):
+            positive_integers(codes('1,'), [2], [2])
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestDelimited(unittest.TestCase):
+    def test_it_should_return_field_offsets_for_each_record(self):
+        (starts, ends), xs = Delimited().parse_string('1,22\n333,4\n')
+
+        self.assertEqual(starts.tolist(), [[0, 2], [5, 9]])
+        self.assertEqual(ends.tolist(), [[1, 4], [8, 10]])
+        self.assertEqual(xs, '')
+
+    def test_it_should_return_offsets_into_the_source_string(self):
+        p = Sequence(Literal('a,b\n'), Delimited())
+
+        (_, (starts, ends)), xs = p.parse_string('a,b\n1,22\n')
+
+        self.assertEqual(starts.tolist(), [[4, 6]])
+        self.assertEqual(ends.tolist(), [[5, 8]])
+
+    def test_it_should_raise_an_error_for_ragged_records(self):
+        with self.assertRaises(ImproperInputError):
+            Delimited().parse_string('1,2\n3')
+
+        with self.assertRaises(ImproperInputError):
+            Delimited().parse_string('1\n2,3')
+
+    def test_it_should_raise_an_error_for_empty_input(self):
+        with self.assertRaises(NotEnoughInputError):
+            Delimited().parse_string('')
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestTable(unittest.TestCase):
+    def test_it_should_return_converted_columns(self):
+        p = Table([int, None, len], field_sep=';')
+        (numbers, names, lengths), _ = p.parse_string('1;arst;ab\n23;yo;abc\n')
+
+        self.assertEqual(numbers.tolist(), [1, 23])
+        self.assertEqual(names, ['arst', 'yo'])
+        self.assertEqual(lengths, [2, 3])
+
+    def test_it_should_convert_signed_integers_field_by_field(self):
+        (numbers,), _ = Table([int]).parse_string('-5\n+7\n12\n')
+
+        self.assertEqual(numbers.tolist(), [-5, 7, 12])
+
+    def test_it_should_raise_an_error_if_a_column_cannot_be_converted(self):
+        with self.assertRaises(ImproperInputError):
+            Table([int, int]).parse_string('1,2\n3,x\n')
+
+        with self.assertRaises(ImproperInputError):
+            Table([int]).parse_string('1,2\n')
+
+    def test_it_should_freeze_cached_columns(self):
+        p = Table([int, None]).cached()
+        (numbers, names), _ = p.parse_string('1,arst\n23,yo\n')
+
+        self.assertEqual(names, ('arst', 'yo'))
+
+        with self.assertRaises(ValueError):
+            numbers[0] = 2
+
+        self.assertEqual(p.parse_string('1,arst\n23,yo\n')[0][0].tolist(), [1, 23])
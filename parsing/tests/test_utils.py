@@ -1,8 +1,9 @@
 from __future__ import unicode_literals
 
+from functools import reduce
 import unittest
 
-from ..utils import compose, flatten, truncate, join, unary, equals
+from ..utils import compose, flatten, iflatten, freeze, truncate, join, unary, equals
 
 
 class TestEquals(unittest.TestCase):
@@ -29,6 +30,13 @@ class TestTruncate(unittest.TestCase):
         self.assertEqual(truncate('arstarstars'), 'arstarstar...')
         self.assertEqual(truncate('arstarstarstarstarstarstarstarst'), 'arstarstar...')
 
+    def test_it_should_truncate_the_head_of_a_stream(self):
+        class Stream(object):
+            def head(self, n):
+                return 'arstarstarstarst'[:n]
+
+        self.assertEqual(truncate(Stream()), 'arstarstar...')
+
 
 class TestCompose(unittest.TestCase):
     def test_it_should_compose_the_given_functions(self):
@@ -55,3 +63,31 @@ class TestFlatten(unittest.TestCase):
             flatten(heavily_nested),
             list(range(1000)),
         )
+
+    def test_it_should_flatten_long_nested_lists(self):
+        self.assertEqual(
+            flatten([[i, (i,)] for i in range(10000)]),
+            [i for i in range(10000) for _ in range(2)],
+        )
+
+
+class TestIflatten(unittest.TestCase):
+    def test_it_should_lazily_flatten_an_arbitrarily_nested_list(self):
+        xs = iflatten([1, [2, (3, [])], [[4]]])
+
+        self.assertEqual(next(xs), 1)
+        self.assertEqual(list(xs), [2, 3, 4])
+
+    def test_it_should_only_flatten_the_given_sequence_types(self):
+        self.assertEqual(list(iflatten([1, (2, [3])], (list,))), [1, (2, [3])])
+
+
+class TestFreeze(unittest.TestCase):
+    def test_it_should_convert_lists_and_sets_recursively(self):
+        self.assertEqual(freeze([1, (2, [3]), {4}]), (1, (2, (3,)), frozenset([4])))
+
+    def test_it_should_return_other_values_unchanged(self):
+        x = object()
+
+        self.assertIs(freeze(x), x)
+        self.assertEqual(freeze('arst'), 'arst')
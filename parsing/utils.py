@@ -3,8 +3,21 @@ from __future__ import unicode_literals
 from functools import partial
 import operator
 
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
 
 def truncate(s):
+    # Only format as much of a stream or string as could be shown
+    if hasattr(s, 'head'):
+        s = s.head(11)
+    elif isinstance(s, string_types):
+        s = s[:11]
+    else:
+        s = '{0}'.format(s)
+
     return '{0:.10}...'.format(s) if len(s) > 10 else s
 
 
@@ -21,22 +34,58 @@ def equals(x):
 
 
 def compose(*fs):
+    fs = tuple(reversed(fs))
+
     def composed(x):
-        return reduce(lambda x, f: f(x), reversed(fs), x)
+        for f in fs:
+            x = f(x)
+
+        return x
 
     return composed
 
 
+def iflatten(seq, seqtypes=(list, tuple)):
+    # Walk nested sequences with an explicit stack of iterators so that each
+    # item is visited once regardless of nesting depth
+    stack = [iter(seq)]
+
+    while stack:
+        for x in stack[-1]:
+            if isinstance(x, seqtypes):
+                stack.append(iter(x))
+                break
+
+            yield x
+        else:
+            stack.pop()
+
+
 def flatten(seq, seqtypes=(list, tuple)):
-    # Make copy and cast to list
-    seq = list(seq)
+    return list(iflatten(seq, seqtypes))
+
+
+def freeze(x):
+    """
+    Returns a copy of ``x`` which cannot be modified in place: lists and tuples
+    become tuples and sets become frozensets, recursively, and arrays become
+    read-only copies.  Named tuples keep their type.  Other values are
+    returned as they are.
+    """
+    if isinstance(x, list) or type(x) is tuple:
+        return tuple(freeze(y) for y in x)
+
+    if isinstance(x, tuple) and hasattr(x, '_fields'):
+        return type(x)(*(freeze(y) for y in x))
+
+    if isinstance(x, (set, frozenset)):
+        return frozenset(freeze(y) for y in x)
 
-    # Flatten list in-place
-    for i, _ in enumerate(seq):
-        while isinstance(seq[i], seqtypes):
-            seq[i:i + 1] = seq[i]
+    if hasattr(x, 'setflags'):
+        x = x.copy()
+        x.setflags(write=False)
 
-    return seq
+    return x
 
 
 is_digit = operator.methodcaller('isdigit')
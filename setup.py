@@ -8,4 +8,7 @@ setup(
     version=parsing.version,
     packages=find_packages(),
     test_suite='parsing.tests',
+    extras_require={
+        'table': ['numpy'],
+    },
 )